@@ -22,26 +22,134 @@ import sys
 import json
 import time
 import asyncio
-import websockets
 import hashlib
-import base64
+import mmap
 import argparse
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退标准库 json
+    orjson = None
+
+try:
+    import pybase64 as base64  # 可选依赖：SIMD 实现，接口与标准库 base64 一致
+except ImportError:
+    import base64
+
+
+def write_file_atomic(output_path, data):
+    """
+    先写同目录临时文件再 os.replace 覆盖目标，中途中断（如 Ctrl+C）不会留下半截输出
+    
+    Args:
+        output_path: 输出文件路径
+        data: 要写入的字节串
+    """
+    tmp_path = f"{output_path}.tmp{os.getpid()}"
+    try:
+        Path(tmp_path).write_bytes(data)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# 本地文件哈希缓存：(绝对路径, 大小, mtime_ns, 首尾 64KB 内容指纹) -> MD5，
+# 只用于大文件，重复转录时免去整文件哈希
+HASH_CACHE_PATH = Path.home() / ".cache" / "funasr_spk_server" / "file_hashes.json"
+HASH_CACHE_MAX_ENTRIES = 1000
+HASH_CACHE_EDGE_BYTES = 64 * 1024
+
+
+class FileHashMismatchError(Exception):
+    """服务端整文件 MD5 校验失败（上传内容与 upload_request 中的 file_hash 不一致）"""
+
+
+def hash_cache_key(file_path, file_stat):
+    """
+    本地哈希缓存的键：路径、大小、mtime_ns 加首尾各 64KB 内容的 MD5
+    
+    只读两小段内容，同大小同 mtime 的原地改写也大概率能识别出来
+    """
+    hash_md5 = hashlib.md5(usedforsecurity=False)
+    with open(file_path, "rb") as f:
+        hash_md5.update(f.read(HASH_CACHE_EDGE_BYTES))
+        f.seek(max(0, file_stat.st_size - HASH_CACHE_EDGE_BYTES))
+        hash_md5.update(f.read(HASH_CACHE_EDGE_BYTES))
+    return f"{Path(file_path).resolve()}|{file_stat.st_size}|{file_stat.st_mtime_ns}|{hash_md5.hexdigest()}"
+
+
+def load_hash_cache():
+    """读取本地哈希缓存，文件不存在、损坏或格式不对时返回空字典"""
+    try:
+        data = HASH_CACHE_PATH.read_bytes()
+        hash_cache = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    return hash_cache if isinstance(hash_cache, dict) else {}
+
+
+def save_hash_cache(hash_cache, key, file_hash):
+    """记录一条哈希并写回（尽力而为，写失败只记警告），超出上限时淘汰最早的记录"""
+    hash_cache.pop(key, None)
+    hash_cache[key] = file_hash
+    while len(hash_cache) > HASH_CACHE_MAX_ENTRIES:
+        hash_cache.pop(next(iter(hash_cache)))
+    try:
+        HASH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            data = orjson.dumps(hash_cache)
+        else:
+            data = json.dumps(hash_cache, ensure_ascii=False).encode("utf-8")
+        write_file_atomic(HASH_CACHE_PATH, data)
+    except OSError as e:
+        logger.warning(f"写入本地哈希缓存失败: {e}")
+
+
+class ProgressLogger:
+    """进度日志节流：进度比上次输出增加 ≥ step 个百分点、距上次输出超过 interval 秒或到达 100% 时才输出"""
+    
+    def __init__(self, label, step=5, interval=0.5):
+        self.label = label
+        self.step = step
+        self.interval = interval
+        self._last_progress = None
+        self._last_time = 0.0
+    
+    def log(self, progress, suffix=""):
+        now = time.monotonic()
+        if (self._last_progress is not None
+                and progress < 100
+                and progress - self._last_progress < self.step
+                and now - self._last_time < self.interval):
+            return
+        self._last_progress = progress
+        self._last_time = now
+        logger.info(f"{self.label}: {progress:.1f}%{suffix}")
+
 
 class MediaTranscriber:
     """音视频转录器"""
     
-    def __init__(self, server_url="ws://localhost:8767"):
+    # 分片上传时允许同时在途（已发送未确认）的分片数
+    CHUNK_UPLOAD_WINDOW = 8
+    
+    def __init__(self, server_url="ws://localhost:8767", verify_chunks=False):
         """
         初始化转录器
         
         Args:
             server_url: WebSocket 服务器地址
+            verify_chunks: 分片上传时是否为每片附带 MD5 供服务端逐片校验；
+                关闭时完整性由服务端的整文件 MD5 校验兜底，省去一遍逐片哈希
         """
         self.server_url = server_url
+        self.verify_chunks = verify_chunks
         self.websocket = None
         
     async def connect_to_server(self):
@@ -49,16 +157,20 @@ class MediaTranscriber:
         try:
             logger.info(f"正在连接到转录服务器: {self.server_url}")
             
+            # 延迟导入：--help / 参数错误时不必付 websockets 的导入开销
+            import websockets
+            
             # 连接 WebSocket 服务器（优化大文件传输配置）
             self.websocket = await websockets.connect(
                 self.server_url,
                 ping_interval=60,   # 60秒发送一次心跳
                 ping_timeout=120,   # 心跳响应超时120秒
-                close_timeout=60,   # 关闭连接超时60秒
+                close_timeout=5,    # 关闭握手最多等5秒，避免退出时长时间挂起
                 max_size=10 * 1024 * 1024,  # 单消息最大10MB
                 # 增加读写缓冲区
                 read_limit=2**20,   # 1MB读缓冲
-                write_limit=2**20   # 1MB写缓冲
+                write_limit=2**20,  # 1MB写缓冲
+                compression=None    # 不协商 permessage-deflate：音视频已压缩，deflate 只耗 CPU
             )
             
             # 接收服务器连接确认消息
@@ -74,6 +186,22 @@ class MediaTranscriber:
             logger.error(f"连接服务器失败: {e}")
             return False
     
+    @asynccontextmanager
+    async def connect(self):
+        """
+        连接服务器的异步上下文管理器，退出时（含异常与取消）保证断开连接
+        
+        Raises:
+            ConnectionError: 连接服务器失败
+        """
+        try:
+            # connect_to_server 可能已建立连接、却在等欢迎消息时失败，同样要走 finally 关闭
+            if not await self.connect_to_server():
+                raise ConnectionError("无法连接到转录服务器")
+            yield self
+        finally:
+            await self.disconnect_from_server()
+    
     async def disconnect_from_server(self):
         """断开服务器连接"""
         if self.websocket:
@@ -90,12 +218,21 @@ class MediaTranscriber:
         Returns:
             str: MD5 哈希值
         """
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
+        # MD5 只作内容指纹，标记 usedforsecurity=False（FIPS 模式的 OpenSSL 下否则会被拒绝/走额外检查）
+        hash_md5 = hashlib.md5(usedforsecurity=False)
+        # 复用同一块 1MB 缓冲区 readinto，不为每块新分配 bytes
+        buf = memoryview(bytearray(1 << 20))
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                hash_md5.update(buf[:n])
         return hash_md5.hexdigest()
     
+    @staticmethod
+    def _read_file(file_path):
+        """读取整个文件内容"""
+        with open(file_path, "rb") as f:
+            return f.read()
+    
     async def send_message(self, message):
         """
         发送消息到服务器
@@ -106,9 +243,13 @@ class MediaTranscriber:
         if not self.websocket:
             raise Exception("未连接到服务器")
         
-        message_json = json.dumps(message, ensure_ascii=False)
+        # 以文本帧发送：兼容把所有二进制帧都当作分片数据解析的旧版服务端
+        if orjson is not None:
+            message_json = orjson.dumps(message).decode('utf-8')
+        else:
+            message_json = json.dumps(message, ensure_ascii=False)
         await self.websocket.send(message_json)
-        logger.debug(f"发送消息: {message['type']}")
+        logger.opt(lazy=True).debug("发送消息: {}", lambda: message['type'])
     
     async def receive_message(self, timeout=30):
         """
@@ -127,8 +268,8 @@ class MediaTranscriber:
             message_json = await asyncio.wait_for(
                 self.websocket.recv(), timeout=timeout
             )
-            message = json.loads(message_json)
-            logger.debug(f"接收消息: {message.get('type', 'unknown')}")
+            message = orjson.loads(message_json) if orjson is not None else json.loads(message_json)
+            logger.opt(lazy=True).debug("接收消息: {}", lambda: message.get('type', 'unknown'))
             return message
         except asyncio.TimeoutError:
             raise Exception(f"接收消息超时 ({timeout}秒)")
@@ -138,47 +279,75 @@ class MediaTranscriber:
         转录音视频文件
         
         Args:
-            audio_path: 音视频文件路径
+            audio_path: 音视频文件路径（str 或 Path）
             output_format: 输出格式，支持 'json' 或 'srt'
             force_refresh: 是否强制刷新缓存
             
         Returns:
             dict: 转录结果
         """
-        logger.info(f"开始转录文件: {os.path.basename(audio_path)}")
+        audio_path = Path(audio_path)
+        file_name = audio_path.name
+        logger.info(f"开始转录文件: {file_name}")
         start_time = time.time()
         
-        # 验证文件存在性
-        if not os.path.exists(audio_path):
+        # 一次 stat 同时验证存在性并取得大小
+        try:
+            file_stat = audio_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"文件不存在: {audio_path}")
-        
-        file_name = os.path.basename(audio_path)
-        file_size = os.path.getsize(audio_path)
-        file_hash = self.calculate_file_hash(audio_path)
-        
-        logger.info(f"文件信息: {file_name}, 大小: {file_size/1024/1024:.2f}MB, 哈希: {file_hash[:8]}...")
+        file_size = file_stat.st_size
         
         # 判断是否使用分片上传（大于5MB的文件）
         chunk_threshold = 5 * 1024 * 1024  # 5MB
         use_chunked_upload = file_size > chunk_threshold
         
+        # 小文件一次读入内存，哈希和上传共用这份数据，只读一遍盘；
+        # 大文件仍需先单独算哈希：upload_request 要带 file_hash 让服务端先查缓存，命中时整个上传都省掉
+        # 读盘和 MD5 都放到线程里（hashlib 计算时释放 GIL），期间事件循环照常处理 ping
+        file_data = None
+        hash_from_cache = False
+        if use_chunked_upload:
+            # 同一文件（路径、大小、mtime、首尾内容都未变）重复转录时复用本地记录的 MD5，不再整读一遍；
+            # 强制刷新时不信任本地记录，重新计算；缓存文件的读写同样放到线程里
+            cache_key = await asyncio.to_thread(hash_cache_key, audio_path, file_stat)
+            hash_cache = await asyncio.to_thread(load_hash_cache)
+            file_hash = None if force_refresh else hash_cache.get(cache_key)
+            if file_hash is None:
+                file_hash = await asyncio.to_thread(self.calculate_file_hash, audio_path)
+                await asyncio.to_thread(save_hash_cache, hash_cache, cache_key, file_hash)
+            else:
+                hash_from_cache = True
+                logger.info("命中本地哈希缓存，跳过文件哈希计算")
+        else:
+            file_data = await asyncio.to_thread(self._read_file, audio_path)
+            file_hash = await asyncio.to_thread(lambda: hashlib.md5(file_data, usedforsecurity=False).hexdigest())
+        
+        logger.info(f"文件信息: {file_name}, 大小: {file_size/1024/1024:.2f}MB, 哈希: {file_hash[:8]}...")
+        
         if use_chunked_upload:
             logger.info(f"文件较大（{file_size/1024/1024:.2f}MB），使用分片上传")
-            return await self._transcribe_file_chunked(audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time)
+            try:
+                return await self._transcribe_file_chunked(audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time)
+            except FileHashMismatchError:
+                if not hash_from_cache:
+                    raise
+                # 本地记录已过期：用重新计算的哈希覆盖该条，再重传一次
+                logger.warning("本地哈希缓存与文件内容不符，重新计算哈希后重试")
+                file_hash = await asyncio.to_thread(self.calculate_file_hash, audio_path)
+                await asyncio.to_thread(save_hash_cache, hash_cache, cache_key, file_hash)
+                return await self._transcribe_file_chunked(audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time)
         else:
             logger.info(f"文件较小（{file_size/1024/1024:.2f}MB），使用单文件上传")
-            return await self._transcribe_file_single(audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time)
+            # 文件内容的唯一引用交给协程，本地置空，这样编码后协程一释放，整个等待转录期间都不再驻留
+            single_upload = self._transcribe_file_single(file_data, file_name, file_size, file_hash, output_format, force_refresh, start_time)
+            file_data = None
+            return await single_upload
     
-    async def _transcribe_file_single(self, audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time):
+    async def _transcribe_file_single(self, file_data, file_name, file_size, file_hash, output_format, force_refresh, start_time):
         """
-        单文件上传转录
+        单文件上传转录（file_data 为已读入内存的文件内容，调用方不再保留引用，编码后即释放）
         """
-        # 读取音频文件
-        with open(audio_path, 'rb') as f:
-            file_data = f.read()
-        
-        file_data_b64 = base64.b64encode(file_data).decode('utf-8')
-        
         # 1. 发送上传请求
         upload_request = {
             "type": "upload_request",
@@ -204,16 +373,20 @@ class MediaTranscriber:
             task_id = response["data"]["task_id"]
             logger.info(f"获得任务ID: {task_id}")
             
-            # 2. 上传文件数据
+            # 2. 上传文件数据（到这里才做 base64 编码，缓存命中时完全不必编码）
             upload_data = {
                 "type": "upload_data",
                 "data": {
                     "task_id": task_id,
-                    "file_data": file_data_b64
+                    "file_data": await asyncio.to_thread(lambda: base64.b64encode(file_data).decode('ascii'))
                 }
             }
+            # 原始文件内容编码后就用不到了，先释放，只剩 base64 载荷
+            file_data = None
             
             await self.send_message(upload_data)
+            # 发送后立即释放 base64 载荷（约 1.33 倍文件大小），不让它在整个转录等待期间驻留内存
+            del upload_data
             response = await self.receive_message()
             
             if response["type"] == "error":
@@ -239,18 +412,14 @@ class MediaTranscriber:
         
         # 3. 等待转录结果
         transcription_result = None
+        transcribe_progress = ProgressLogger("转录进度")
         
         while True:
             try:
                 response = await self.receive_message(timeout=300)  # 5分钟超时
                 
-                if response["type"] == "task_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
-                
-                elif response["type"] == "transcription_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
+                if response["type"] in ("task_progress", "transcription_progress"):
+                    transcribe_progress.log(response["data"]["progress"])
                 
                 elif response["type"] == "task_complete":
                     transcription_result = response["data"]["result"]
@@ -289,11 +458,44 @@ class MediaTranscriber:
             "cached_result": False
         }
     
+    @staticmethod
+    def _build_chunk_frame(file_view, task_id, chunk_index, chunk_size, total_chunks, verify):
+        """
+        构造分片的二进制帧: [4 字节大端 header 长度][JSON header][原始分片字节]
+        
+        不再 base64 编码进 JSON，传输量减少约 1/3；同步函数，可放到线程里执行。
+        拼帧会把分片从 mmap 复制一次到新 bytes：客户端帧必须加掩码，websockets 发送时
+        无论如何都要再生成一份掩码后的副本，零拷贝发送做不到；这次复制放在预取线程里，
+        与上一片的发送重叠，且让分片视图在返回前就能释放
+        """
+        offset = chunk_index * chunk_size
+        # 分片视图用完即释放，否则 mmap 关闭时会因仍有导出缓冲区而报错
+        with file_view[offset:offset + chunk_size] as chunk_data:
+            header = {
+                "task_id": task_id,
+                "chunk_index": chunk_index,
+                "is_last": chunk_index == total_chunks - 1
+            }
+            if verify:
+                header["chunk_hash"] = hashlib.md5(chunk_data, usedforsecurity=False).hexdigest()
+            header = orjson.dumps(header) if orjson is not None else json.dumps(header).encode('utf-8')
+            return b"".join((len(header).to_bytes(4, "big"), header, chunk_data))
+    
+    async def _wait_chunk_ack(self):
+        """等待一个分片确认，收到非 chunk_received 消息时报错"""
+        chunk_response = await self.receive_message(timeout=60)  # 60秒超时
+        if chunk_response["type"] != "chunk_received":
+            chunk_index = chunk_response.get("data", {}).get("chunk_index", "?")
+            detail = chunk_response.get("data", {}).get("message", chunk_response.get("type", "unknown"))
+            raise Exception(f"分片 {chunk_index} 上传失败: {detail}")
+        return chunk_response
+    
     async def _transcribe_file_chunked(self, audio_path, file_name, file_size, file_hash, output_format, force_refresh, start_time):
         """
         分片上传转录大文件
         """
-        chunk_size = 1024 * 1024  # 1MB分片大小
+        # 分片大小随文件缩放：约 256 片封顶，夹在 1MB ~ 8MB 之间，大文件少走几百次确认往返
+        chunk_size = min(8 * 1024 * 1024, max(1024 * 1024, file_size // 256))
         total_chunks = (file_size + chunk_size - 1) // chunk_size
         
         logger.info(f"分片信息: 分片大小={chunk_size/1024/1024:.2f}MB, 总分片数={total_chunks}")
@@ -345,52 +547,59 @@ class MediaTranscriber:
         logger.info(f"获得任务ID: {task_id}，开始分片上传")
         
         # 2. 分片读取和上传
-        with open(audio_path, 'rb') as f:
-            for chunk_index in range(total_chunks):
-                # 读取分片数据
-                chunk_data = f.read(chunk_size)
-                chunk_hash = hashlib.md5(chunk_data).hexdigest()
-                
-                # 发送分片
-                chunk_message = {
-                    "type": "upload_chunk",
-                    "data": {
-                        "task_id": task_id,
-                        "chunk_index": chunk_index,
-                        "chunk_size": len(chunk_data),
-                        "chunk_hash": chunk_hash,
-                        "chunk_data": base64.b64encode(chunk_data).decode(),
-                        "is_last": chunk_index == total_chunks - 1
-                    }
-                }
-                
-                await self.send_message(chunk_message)
-                
-                # 等待分片确认
-                chunk_response = await self.receive_message(timeout=60)  # 60秒超时
-                if chunk_response["type"] != "chunk_received":
-                    raise Exception(f"分片 {chunk_index} 上传失败: {chunk_response.get('type', 'unknown')}")
-                
-                # 显示进度
-                progress = (chunk_index + 1) / total_chunks * 100
-                logger.info(f"上传进度: {progress:.1f}% ({chunk_index + 1}/{total_chunks})")
+        # 文件 mmap 后按分片切 memoryview，哈希直接读页缓存；组帧时复制一次（见 _build_chunk_frame）
+        upload_progress = ProgressLogger("上传进度")
+        acked_chunks = 0
+        with open(audio_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as file_view:
+            def prefetch(chunk_index):
+                return asyncio.ensure_future(asyncio.to_thread(
+                    self._build_chunk_frame, file_view, task_id, chunk_index, chunk_size, total_chunks,
+                    self.verify_chunks
+                ))
+            
+            # 哈希和组帧在线程里预取下一片，与当前分片的发送/等确认重叠
+            frame_task = prefetch(0)
+            try:
+                for chunk_index in range(total_chunks):
+                    frame = await frame_task
+                    if chunk_index + 1 < total_chunks:
+                        frame_task = prefetch(chunk_index + 1)
+                    
+                    # 滑动窗口：在途分片达到上限时先收一个确认再继续发送，
+                    # 避免逐片"发送-等确认"让链路在每个 RTT 内空闲
+                    if chunk_index - acked_chunks >= self.CHUNK_UPLOAD_WINDOW:
+                        await self._wait_chunk_ack()
+                        acked_chunks += 1
+                        upload_progress.log(acked_chunks / total_chunks * 100,
+                                            f" ({acked_chunks}/{total_chunks})")
+                    
+                    await self.websocket.send(frame)
+            finally:
+                # 异常退出时等预取线程结束：它持有的分片视图未释放前 mmap 无法关闭
+                if not frame_task.done():
+                    await asyncio.gather(frame_task, return_exceptions=True)
+            
+            # 收齐剩余在途分片的确认（服务端按接收顺序逐片确认）
+            while acked_chunks < total_chunks:
+                await self._wait_chunk_ack()
+                acked_chunks += 1
+                upload_progress.log(acked_chunks / total_chunks * 100,
+                                    f" ({acked_chunks}/{total_chunks})")
         
         logger.info("文件分片上传完成，等待处理结果...")
         
         # 3. 等待转录结果
         transcription_result = None
+        transcribe_progress = ProgressLogger("转录进度")
         
         while True:
             try:
                 response = await self.receive_message(timeout=300)  # 5分钟超时
                 
-                if response["type"] == "task_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
-                
-                elif response["type"] == "transcription_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
+                if response["type"] in ("task_progress", "transcription_progress"):
+                    transcribe_progress.log(response["data"]["progress"])
                 
                 elif response["type"] == "task_complete":
                     transcription_result = response["data"]["result"]
@@ -415,6 +624,8 @@ class MediaTranscriber:
                     continue
                 
                 elif response["type"] == "error":
+                    if response["data"].get("error") == "file_hash_mismatch":
+                        raise FileHashMismatchError(response["data"]["message"])
                     raise Exception(f"转录失败: {response['data']['message']}")
                 
             except Exception as e:
@@ -450,16 +661,17 @@ class MediaTranscriber:
             output_path: 输出文件路径
         """
         # 创建输出目录
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
         # 添加转录时间戳
         result["transcription_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # 保存为 JSON 文件
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        # 保存为 JSON 文件（有 orjson 时一次序列化为 UTF-8 字节，格式同为 2 空格缩进、不转义中文）
+        if orjson is not None:
+            data = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(result, ensure_ascii=False, indent=2).encode("utf-8")
+        write_file_atomic(output_path, data)
         
         logger.info(f"转录结果已保存到: {output_path}")
 
@@ -486,6 +698,8 @@ async def main():
                        help="输出格式 (默认: json)")
     parser.add_argument("--force-refresh", action="store_true",
                        help="强制刷新缓存，重新进行转录")
+    parser.add_argument("--verify-chunks", action="store_true",
+                       help="分片上传时逐片 MD5 校验（默认只做整文件校验）")
     parser.add_argument("--verbose", "-v", action="store_true",
                        help="显示详细日志")
     
@@ -523,37 +737,30 @@ async def main():
     logger.info(f"输出格式: {args.format}")
     logger.info(f"强制刷新: {args.force_refresh}")
     
-    # 创建转录器
-    transcriber = MediaTranscriber(server_url=args.server)
-    
     try:
-        # 连接服务器
-        if not await transcriber.connect_to_server():
-            logger.error("无法连接到转录服务器")
-            return 1
-        
-        # 执行转录
-        result = await transcriber.transcribe_file(
-            str(input_path), 
-            output_format=args.format,
-            force_refresh=args.force_refresh
-        )
-        
-        # 保存结果
-        if args.format == "srt":
-            # 对于 SRT 格式，直接保存内容
-            transcription_data = result.get("transcription_result", {})
-            if transcription_data.get("format") == "srt":
-                srt_content = transcription_data.get("content", "")
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(srt_content)
-                logger.info(f"SRT 文件已保存到: {output_path}")
+        # 连接服务器；退出 async with 时（含异常/中断）自动关闭连接
+        async with MediaTranscriber(server_url=args.server, verify_chunks=args.verify_chunks).connect() as transcriber:
+            # 执行转录
+            result = await transcriber.transcribe_file(
+                input_path, 
+                output_format=args.format,
+                force_refresh=args.force_refresh
+            )
+            
+            # 保存结果
+            if args.format == "srt":
+                # 对于 SRT 格式，直接保存内容
+                transcription_data = result.get("transcription_result", {})
+                if transcription_data.get("format") == "srt":
+                    srt_content = transcription_data.get("content", "")
+                    write_file_atomic(output_path, srt_content.encode("utf-8"))
+                    logger.info(f"SRT 文件已保存到: {output_path}")
+                else:
+                    logger.error("未收到 SRT 格式的转录结果")
+                    return 1
             else:
-                logger.error("未收到 SRT 格式的转录结果")
-                return 1
-        else:
-            # 保存 JSON 格式结果
-            transcriber.save_transcription_result(result, str(output_path))
+                # 保存 JSON 格式结果
+                transcriber.save_transcription_result(result, str(output_path))
         
         logger.info("✓ 转录完成")
         return 0
@@ -564,11 +771,16 @@ async def main():
     except Exception as e:
         logger.error(f"转录过程中发生错误: {e}")
         return 1
-    finally:
-        await transcriber.disconnect_from_server()
-
 
 if __name__ == "__main__":
+    # 非 Windows 上有 uvloop（requirements.txt 已声明）时用它驱动事件循环，降低逐帧收发的调度开销
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+    
     # 运行转录脚本
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
\ No newline at end of file
@@ -32,6 +32,36 @@ import uuid
 # 50 是起步硬上限，实测帧过大再降。
 TASK_STATUS_BATCH_MAX = 50
 
+# 二进制分片帧: [4 字节大端 header 长度][UTF-8 JSON header][原始分片字节]。
+# header 字段同 upload_chunk 的 data（task_id / chunk_index / chunk_hash / is_last），
+# 只是分片数据直接跟在后面，省掉 base64 编解码和约 1/3 的传输量。
+BINARY_CHUNK_HEADER_LEN_BYTES = 4
+
+
+def parse_binary_chunk_frame(message: bytes) -> dict:
+    """
+    解析二进制分片帧，返回与 upload_chunk data 同构的字典
+
+    分片数据放在 "chunk_bytes"（memoryview，不复制），由 _handle_chunk_upload 直接落盘。
+
+    Raises:
+        ValueError: 帧长度不足、header 越界或 header 不是 JSON 对象
+    """
+    if len(message) < BINARY_CHUNK_HEADER_LEN_BYTES:
+        raise ValueError("二进制帧过短")
+
+    header_len = int.from_bytes(message[:BINARY_CHUNK_HEADER_LEN_BYTES], "big")
+    payload_start = BINARY_CHUNK_HEADER_LEN_BYTES + header_len
+    if payload_start > len(message):
+        raise ValueError("二进制帧 header 长度越界")
+
+    header = json.loads(message[BINARY_CHUNK_HEADER_LEN_BYTES:payload_start])
+    if not isinstance(header, dict):
+        raise ValueError("二进制帧 header 必须是 JSON 对象")
+
+    header["chunk_bytes"] = memoryview(message)[payload_start:]
+    return header
+
 
 class WebSocketHandler:
     """WebSocket连接处理器"""
@@ -67,6 +97,17 @@ class WebSocketHandler:
             # 处理消息
             async for message in websocket:
                 try:
+                    if isinstance(message, bytes) and not message.startswith(b"{"):
+                        # 二进制分片帧；以 "{" 开头的是按二进制帧发送的 JSON 消息（如 ws.send(orjson.dumps(msg))），
+                        # 走下面的 JSON 分支。合法分片帧不会以 "{" 开头（那意味着 header 长度约 2GB）
+                        try:
+                            chunk = parse_binary_chunk_frame(message)
+                        except ValueError as e:
+                            await self._send_error(websocket, "invalid_binary_frame", str(e))
+                            continue
+                        await self._handle_chunk_upload(websocket, connection_id, chunk)
+                        continue
+
                     data = json.loads(message)
                     await self._handle_message(websocket, connection_id, data)
                 except json.JSONDecodeError:
@@ -646,18 +687,18 @@ class WebSocketHandler:
                 })
                 return
             
-            # 解码和验证分片数据
-            chunk_data_base64 = data.get("chunk_data")
-            if not chunk_data_base64:
+            # 解码和验证分片数据：二进制帧直接带 chunk_bytes，JSON 帧带 base64 的 chunk_data
+            chunk_data = data.get("chunk_bytes")
+            if chunk_data is None:
+                chunk_data_base64 = data.get("chunk_data")
+                chunk_data = base64.b64decode(chunk_data_base64) if chunk_data_base64 else None
+            if not chunk_data:
                 await self._send_error(websocket, "missing_chunk_data", "缺少分片数据")
                 return
             
-            chunk_data = base64.b64decode(chunk_data_base64)
-            chunk_hash = hashlib.md5(chunk_data).hexdigest()
-            
-            # 验证分片哈希
+            # 验证分片哈希（客户端未附带 chunk_hash 时跳过，完整性由 finalize 的整文件校验兜底）
             expected_hash = data.get("chunk_hash")
-            if expected_hash and chunk_hash != expected_hash:
+            if expected_hash and hashlib.md5(chunk_data).hexdigest() != expected_hash:
                 await self._send_error(websocket, "chunk_hash_mismatch", 
                                      f"分片 {chunk_index} 哈希校验失败")
                 return
@@ -697,78 +738,88 @@ class WebSocketHandler:
         try:
             session = self.upload_sessions[task_id]
             
-            logger.info(f"完成分片上传: {task_id}, 验证文件完整性...")
-            
-            # 验证完整文件哈希
-            file_hash = self._calculate_file_hash(session["temp_file_path"])
-            if file_hash != session["file_hash"]:
-                await self._send_error(websocket, "file_hash_mismatch", "文件完整性校验失败")
-                return
+            # queue_full 重试：首次 finalize 已校验哈希、查过缓存并把临时文件 rename 到上传目录，
+            # 临时文件已不存在，直接复用已落地文件提交，不再重复校验
+            file_path = session.get("finalized_file_path")
+            reuse_finalized = bool(file_path and os.path.exists(file_path))
+            if reuse_finalized:
+                logger.info(f"重试提交分片上传: {task_id}, 复用已落地文件")
+            else:
+                logger.info(f"完成分片上传: {task_id}, 验证文件完整性...")
             
-            # 检查缓存（如果不强制刷新）
-            # cache key 含 engine（session 中已记录，无则回退 default_engine）;
-            # word_align / diarize 折维收拢在 cache_params (D4, 此处无 task 对象走低层入口)
-            if not session["force_refresh"]:
-                from src.core.database import db_manager, cache_params
-                from src.core.config import config as _config
-                from src.models.schemas import TranscribeOptions, resolve_word_align
-                _engine_for_cache = session.get("engine") or _config.transcription.default_engine
-                _session_options = TranscribeOptions(
-                    language=session.get("language"),
-                    diarize=session.get("diarize", True),
-                    # 决策 1A: 早返回缓存路径同样解析 effective word_align（请求 > config 兜底）
-                    word_align=resolve_word_align(
-                        session.get("word_align"), _config.qwen3.word_align_enabled
-                    ),
-                )
-                _ce, _allow = cache_params(_engine_for_cache, _session_options)
-                cached_result = await db_manager.get_cached_result(
-                    session["file_hash"], session["output_format"], engine=_ce, allow_cross_engine=_allow,
-                    options=_session_options,
+                # 验证完整文件哈希（大文件整读一遍，移到线程池，不冻事件循环/心跳）
+                loop = asyncio.get_running_loop()
+                file_hash = await loop.run_in_executor(
+                    None, self._calculate_file_hash, session["temp_file_path"]
                 )
-                if cached_result:
-                    logger.info(f"使用缓存结果（分片上传阶段）: {task_id}")
-
-                    # E2: 早返回出口组装 effective options 回显 (session 回填值已在
-                    # _session_options 收拢, 优先级 request > session 回填 > config)
-                    # DRY(commit 1): projected 提取 + metadata 构建走共享纯函数 cache_hit_metadata
-                    from src.core.result_projection import cache_hit_metadata
-                    _md, _proj, _srt_ok = cache_hit_metadata(
-                        cached_result, engine=_engine_for_cache, options=_session_options,
-                        output_format=session["output_format"],
+                if file_hash != session["file_hash"]:
+                    await self._send_error(websocket, "file_hash_mismatch", "文件完整性校验失败")
+                    return
+            
+                # 检查缓存（如果不强制刷新）
+                # cache key 含 engine（session 中已记录，无则回退 default_engine）;
+                # word_align / diarize 折维收拢在 cache_params (D4, 此处无 task 对象走低层入口)
+                if not session["force_refresh"]:
+                    from src.core.database import db_manager, cache_params
+                    from src.core.config import config as _config
+                    from src.models.schemas import TranscribeOptions, resolve_word_align
+                    _engine_for_cache = session.get("engine") or _config.transcription.default_engine
+                    _session_options = TranscribeOptions(
+                        language=session.get("language"),
+                        diarize=session.get("diarize", True),
+                        # 决策 1A: 早返回缓存路径同样解析 effective word_align（请求 > config 兜底）
+                        word_align=resolve_word_align(
+                            session.get("word_align"), _config.qwen3.word_align_enabled
+                        ),
                     )
-
-                    # 根据输出格式准备结果
-                    if session["output_format"] == "srt":
-                        if _srt_ok:
-                            # cache_hit_metadata 用 get 不 pop, 此处排除 projected key 不泄漏给客户端
-                            result_data = {k: v for k, v in cached_result.items() if k != "projected"}
-                            result_data["metadata"] = _md
+                    _ce, _allow = cache_params(_engine_for_cache, _session_options)
+                    cached_result = await db_manager.get_cached_result(
+                        session["file_hash"], session["output_format"], engine=_ce, allow_cross_engine=_allow,
+                        options=_session_options,
+                    )
+                    if cached_result:
+                        logger.info(f"使用缓存结果（分片上传阶段）: {task_id}")
+
+                        # E2: 早返回出口组装 effective options 回显 (session 回填值已在
+                        # _session_options 收拢, 优先级 request > session 回填 > config)
+                        # DRY(commit 1): projected 提取 + metadata 构建走共享纯函数 cache_hit_metadata
+                        from src.core.result_projection import cache_hit_metadata
+                        _md, _proj, _srt_ok = cache_hit_metadata(
+                            cached_result, engine=_engine_for_cache, options=_session_options,
+                            output_format=session["output_format"],
+                        )
+
+                        # 根据输出格式准备结果
+                        if session["output_format"] == "srt":
+                            if _srt_ok:
+                                # cache_hit_metadata 用 get 不 pop, 此处排除 projected key 不泄漏给客户端
+                                result_data = {k: v for k, v in cached_result.items() if k != "projected"}
+                                result_data["metadata"] = _md
+                            else:
+                                result_data = None
                         else:
-                            result_data = None
-                    else:
-                        cached_result.metadata = _md
-                        result_data = cached_result.model_dump()
+                            cached_result.metadata = _md
+                            result_data = cached_result.model_dump()
                     
-                    if result_data:
-                        # 清理临时文件和会话
-                        await self._cleanup_upload_session(task_id)
+                        if result_data:
+                            # 清理临时文件和会话
+                            await self._cleanup_upload_session(task_id)
                         
-                        # 直接返回缓存结果
-                        await self._send_message(websocket, "task_complete", {
-                            "task_id": task_id,
-                            "result": result_data
-                        })
-                        return
+                            # 直接返回缓存结果
+                            await self._send_message(websocket, "task_complete", {
+                                "task_id": task_id,
+                                "result": result_data
+                            })
+                            return
             
             # 移动文件到最终位置（queue_full 重试时复用已落地文件，不重复落盘）
-            from src.utils.file_utils import save_uploaded_file
+            # 哈希已在上面校验，直接 rename 临时文件，不再整文件读入内存后重写
+            from src.utils.file_utils import move_uploaded_file
 
-            file_path = session.get("finalized_file_path")
-            if not (file_path and os.path.exists(file_path)):
-                with open(session["temp_file_path"], "rb") as f:
-                    file_data = f.read()
-                file_path, _ = await save_uploaded_file(file_data, session["file_name"])
+            if not reuse_finalized:
+                file_path = await move_uploaded_file(
+                    session["temp_file_path"], session["file_name"], session["file_hash"]
+                )
                 session["finalized_file_path"] = file_path
 
             # 创建任务请求对象
@@ -873,13 +924,14 @@ class WebSocketHandler:
                 del self.upload_sessions[task_id]
                 logger.info(f"清理遗弃上传会话(TTL): {task_id}")
     
-    def _calculate_file_hash(self, file_path: str, chunk_size: int = 8192) -> str:
+    def _calculate_file_hash(self, file_path: str, chunk_size: int = 1 << 20) -> str:
         """高效计算文件哈希"""
         hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            # 分块计算哈希，避免大文件内存占用
-            for chunk in iter(lambda: f.read(chunk_size), b""):
-                hash_md5.update(chunk)
+        # 分块计算哈希，避免大文件内存占用；复用同一缓冲区 readinto，不为每块新分配 bytes
+        buf = memoryview(bytearray(chunk_size))
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                hash_md5.update(buf[:n])
         return hash_md5.hexdigest()
     
     def _remove_session_files(self, session: dict, delete_finalized: bool = True):
@@ -371,7 +371,8 @@ class FunASRTranscriber:
         """解析FunASR结果并合并相同说话人的连续句子"""
         segments = []
         
-        logger.debug(f"解析结果 - 输入类型: {type(result)}, 内容: {result}")
+        # 长音频的原始结果很大，只在 DEBUG 实际启用时才格式化
+        logger.opt(lazy=True).debug("解析结果 - 输入类型: {}, 内容: {}", lambda: type(result), lambda: result)
         
         # 处理结果格式
         if isinstance(result, list):
@@ -441,39 +442,30 @@ class FunASRTranscriber:
         if not segments:
             return segments
         
-        merged = []
-        current = segments[0]
-        
         logger.debug(f"开始合并 {len(segments)} 个片段")
         
+        # 一次扫描找出分组边界：同一说话人且时间间隔小于3秒的连续片段归为一组
+        boundaries = [0]
         for i in range(1, len(segments)):
-            next_seg = segments[i]
-            
-            # 检查是否为同一说话人且时间间隔较短（小于3秒）
-            time_gap = next_seg.start_time - current.end_time
-            
-            logger.debug(f"片段 {i}: {current.speaker} -> {next_seg.speaker}, 时间间隔: {time_gap:.2f}s")
-            
-            if (current.speaker == next_seg.speaker and 
-                time_gap < 3.0):  # 增加到3秒的间隔阈值
-                # 合并文本和时间 - 保留所有标点符号
-                merged_text = current.text + next_seg.text
-                current = TranscriptionSegment(
-                    start_time=current.start_time,
-                    end_time=next_seg.end_time,
-                    text=merged_text,
-                    speaker=current.speaker
-                )
-                logger.debug(f"合并片段: {merged_text[:20]}...")
-            else:
-                # 添加当前片段，开始新的片段
-                merged.append(current)
-                logger.debug(f"完成片段: [{current.speaker}] {current.text[:20]}...")
-                current = next_seg
+            prev_seg, next_seg = segments[i - 1], segments[i]
+            if (next_seg.speaker != prev_seg.speaker or
+                    next_seg.start_time - prev_seg.end_time >= 3.0):  # 增加到3秒的间隔阈值
+                boundaries.append(i)
+        boundaries.append(len(segments))
         
-        # 添加最后一个片段
-        merged.append(current)
-        logger.debug(f"完成片段: [{current.speaker}] {current.text[:20]}...")
+        # 每组只构造一次片段，文本一次 join（保留所有标点符号），避免逐句拼接的二次方开销
+        merged = []
+        for start, end in zip(boundaries, boundaries[1:]):
+            if end - start == 1:
+                merged.append(segments[start])
+                continue
+            group = segments[start:end]
+            merged.append(TranscriptionSegment(
+                start_time=group[0].start_time,
+                end_time=group[-1].end_time,
+                text="".join(seg.text for seg in group),
+                speaker=group[0].speaker
+            ))
         
         logger.info(f"合并完成: {len(segments)} -> {len(merged)} 个片段")
         return merged
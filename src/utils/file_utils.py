@@ -3,6 +3,8 @@
 """
 import os
 import time
+import shutil
+import asyncio
 import hashlib
 import aiofiles
 import ffmpeg
@@ -18,7 +20,7 @@ async def calculate_file_hash(file_path: str) -> str:
     
     async with aiofiles.open(file_path, 'rb') as f:
         while True:
-            chunk = await f.read(8192)
+            chunk = await f.read(1 << 20)  # 1MB 块：aiofiles 每次 read 都是一次线程池往返
             if not chunk:
                 break
             hash_md5.update(chunk)
@@ -56,6 +58,24 @@ async def save_uploaded_file(file_data: bytes, filename: str) -> Tuple[str, str]
     return file_path, file_hash
 
 
+async def move_uploaded_file(temp_path: str, filename: str, file_hash: str) -> str:
+    """把已校验过哈希的临时文件移动到上传目录（命名规则同 save_uploaded_file）
+
+    同一文件系统内是一次 rename，不读入内存也不重写数据；跨文件系统时
+    shutil.move 回退为复制 + 删除，放到线程池里执行以免阻塞事件循环。
+    """
+    Path(config.server.upload_dir).mkdir(parents=True, exist_ok=True)
+    
+    ext = get_file_extension(filename)
+    file_path = str(Path(config.server.upload_dir) / f"{file_hash}{ext}")
+    
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, shutil.move, temp_path, file_path)
+    
+    logger.debug(f"文件已移动: {temp_path} -> {file_path}")
+    return file_path
+
+
 async def delete_file(file_path: str) -> bool:
     """删除文件。返回是否真正删除了文件(文件不存在 / 删除失败 → False)。
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手工脚本共享的音频文件查找工具
+
+一次 os.scandir 遍历目录并按扩展名集合过滤，替代按扩展名多次 glob；
+probe_duration 只读文件头获取时长，不解码音频；
+decode_16k 解码一次并缓存，同一文件被多次推理时不再重复解码/重采样。
+"""
+
+import functools
+import os
+from pathlib import Path
+
+# 手工脚本默认识别的音频/视频扩展名
+AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.mp4', '.m4a', '.flac'})
+
+
+def list_audio(dirpath, exts=AUDIO_EXTENSIONS):
+    """
+    列出目录下扩展名属于 exts 的文件（不递归）
+
+    Args:
+        dirpath: 目录路径，不存在时返回空列表（与 glob 行为一致）
+        exts: 小写扩展名集合（含点号）
+
+    Returns:
+        List[Path]: 按文件名排序的文件路径
+    """
+    if not os.path.isdir(dirpath):
+        return []
+
+    with os.scandir(dirpath) as entries:
+        audio_files = [
+            Path(entry.path) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts
+        ]
+    return sorted(audio_files, key=lambda p: p.name)
+
+
+def first_audio(dirpath, exts=AUDIO_EXTENSIONS):
+    """
+    返回目录下第一个扩展名属于 exts 的文件，找到即停止遍历
+
+    Args:
+        dirpath: 目录路径，不存在时返回 None
+        exts: 小写扩展名集合（含点号）
+
+    Returns:
+        Optional[Path]: 目录遍历顺序下的第一个匹配文件
+    """
+    if not os.path.isdir(dirpath):
+        return None
+
+    with os.scandir(dirpath) as entries:
+        return next(
+            (Path(entry.path) for entry in entries
+             if entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts),
+            None,
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def probe_duration(path):
+    """
+    读取音频时长（秒），只解析文件头
+
+    soundfile 能识别的格式（wav/flac 等）用 sf.info；mp4/m4a 等回退 ffprobe。
+
+    Args:
+        path: 文件路径字符串（lru_cache 需要可哈希参数）
+
+    Returns:
+        float: 时长秒数，探测失败返回 0.0
+    """
+    try:
+        import soundfile as sf
+
+        info = sf.info(path)
+        return info.frames / info.samplerate
+    except Exception:
+        from src.utils.file_utils import get_audio_duration
+
+        return get_audio_duration(path)
+
+
+@functools.lru_cache(maxsize=8)
+def decode_16k(path):
+    """
+    解码为 16kHz 单声道 float32 波形并缓存（复用 qwen3 引擎的 load_audio_mono_16k）
+
+    返回的 ndarray 可直接作为 model.generate(input=...) 的输入；
+    内存紧张时调用 decode_16k.cache_clear() 释放。
+
+    Args:
+        path: 文件路径字符串（lru_cache 需要可哈希参数）
+    """
+    import numpy as np
+    from src.core.qwen3.audio_io import load_audio_mono_16k
+
+    audio, _ = load_audio_mono_16k(path)
+    return np.ascontiguousarray(audio)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手工脚本共享的 JSON 读写工具
+
+优先使用 orjson（C 实现，序列化嵌套 sentence_info 等大结果更快），
+未安装时回退标准库 json，输出格式一致（UTF-8、不转义中文、2 空格缩进）。
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def dumps_json(obj) -> bytes:
+    """序列化为带 2 空格缩进的 UTF-8 字节串"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps_json_line(obj) -> bytes:
+    """序列化为单行 JSON 并带换行符（NDJSON 的一条记录）"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def dump_json(obj, path) -> None:
+    """写 JSON 文件"""
+    Path(path).write_bytes(dumps_json(obj))
+
+
+def load_json(path):
+    """读 JSON 文件"""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手工脚本共享的 AutoModel 懒加载缓存
+
+同一解释器内按初始化参数复用已加载的模型，避免多个文件/多个测试函数
+反复加载 paraformer/VAD/punc/CAM++ 权重。
+
+用法:
+    from tests.manual._model_cache import get_model, warm_model
+    model = get_model(model="paraformer-zh", vad_model="fsmn-vad", ...)
+    warm_model(model)  # 可选：计时前先付掉首次推理开销
+
+环境变量 FUNASR_TEST_QUANT=1 时，CPU 上加载的模型会对 ASR 主模型的 Linear 层做
+int8 动态量化，只适合检查"能转出结果/识别到说话人"的脚本，不要用于准确率对比。
+
+环境变量 FUNASR_TEST_FP16=1 时，CUDA 上加载的模型以 fp16=True 构建（FunASR 会把 ASR
+主模型转为半精度并在推理时把输入特征转 half）；其它设备忽略。推理本身 FunASR 已在
+torch.no_grad() 下执行，无需再关闭 autograd。
+
+环境变量 FUNASR_TEST_TF32=1 时，CUDA 上加载模型前打开 TF32 matmul/cuDNN，
+让仍为 FP32 的 cam++/VAD 等模块在 Ampere 及以上显卡走 Tensor Core；其它设备忽略。
+不支持 bf16：paraformer 推理只在 fp16 时把输入转半精度，bf16 权重会与 FP32 输入类型不匹配。
+
+环境变量 FUNASR_TEST_RESULT_CACHE=<目录> 时，cached_generate 按
+（音频内容哈希, 模型参数, generate 参数）把结果缓存到该目录，反复调试同一批样本时
+命中缓存直接返回，连模型都不加载。性能测试不要开启。
+
+首次加载时会先用线程池并行下载 ASR/VAD/punc/spk 各模型（ModelScope），
+AutoModel 初始化时只剩本地加载；缓存已存在时只是几次并行的版本校验。
+"""
+
+import atexit
+import copy
+import functools
+import gc
+import hashlib
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+# 预热音频：仓库自带的 5 秒单说话人语音。不用静音，静音会被 VAD 滤掉，ASR/spk 模型根本不会被调用
+WARMUP_AUDIO = Path(__file__).resolve().parents[1] / "fixtures" / "audio" / "tts_1speaker_5s.wav"
+
+# 已预热模型的 id，每个实例只预热一次
+_warmed_models = set()
+
+# AutoModel 参数中的 (模型名, 版本) 字段对
+_MODEL_FIELDS = (
+    ("model", "model_revision"),
+    ("vad_model", "vad_model_revision"),
+    ("punc_model", "punc_model_revision"),
+    ("spk_model", "spk_model_revision"),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _build(key):
+    """按排序后的参数元组构建模型（lru_cache 的 key 必须可哈希）"""
+    from funasr import AutoModel
+
+    kwargs = dict(key)
+    if os.environ.get("FUNASR_TEST_TF32") == "1":
+        _enable_tf32(kwargs.get("device"))
+
+    _prefetch_models(kwargs)
+
+    logger.info(f"加载 AutoModel: {kwargs}")
+    model = AutoModel(**kwargs)
+
+    if os.environ.get("FUNASR_TEST_QUANT") == "1":
+        _quantize_asr_model(model, _resolve_device(kwargs.get("device")))
+    return model
+
+
+def _prefetch_models(kwargs):
+    """
+    并行下载 kwargs 中引用的各模型，替代 AutoModel 初始化时的逐个串行下载
+
+    只处理 ModelScope 上的模型名（与 FunASR 一样经 name_maps_ms 映射为仓库 id），
+    本地路径和其它 hub 跳过；下载失败只记警告，交给 AutoModel 按原逻辑重试。
+    """
+    if kwargs.get("hub", "ms") not in ("ms", "modelscope"):
+        return
+
+    try:
+        from funasr.download.name_maps_from_hub import name_maps_ms
+        from modelscope.hub.snapshot_download import snapshot_download
+    except ImportError:
+        return
+
+    targets = [
+        (name_maps_ms.get(kwargs[name_key], kwargs[name_key]), kwargs.get(revision_key))
+        for name_key, revision_key in _MODEL_FIELDS
+        if kwargs.get(name_key) and not os.path.exists(kwargs[name_key])
+    ]
+    if len(targets) < 2:
+        return
+
+    def _download(target):
+        model_id, revision = target
+        try:
+            snapshot_download(model_id, revision=revision)
+        except Exception as e:
+            logger.warning(f"预下载模型失败 {model_id}@{revision}: {e}")
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        list(executor.map(_download, targets))
+
+
+def _quantize_asr_model(model, device):
+    """对 ASR 主模型的 Linear 层做 int8 动态量化（仅 CPU 支持）"""
+    if str(device) != "cpu":
+        logger.warning(f"FUNASR_TEST_QUANT=1 仅支持 CPU，当前设备 {device}，跳过量化")
+        return
+
+    import torch
+
+    torch.ao.quantization.quantize_dynamic(
+        model.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+    logger.info("已对 ASR 模型 Linear 层做 int8 动态量化")
+
+
+def _resolve_device(device):
+    """未指定设备时按 AutoModel 的默认规则解析：有 CUDA 用 CUDA，否则 CPU"""
+    if device is None:
+        import torch
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    return str(device)
+
+
+def _enable_tf32(device):
+    """打开 CUDA 上 FP32 matmul/卷积的 TF32 计算（进程级全局开关）"""
+    import torch
+
+    device = _resolve_device(device)
+
+    if not str(device).startswith("cuda"):
+        logger.warning(f"FUNASR_TEST_TF32=1 仅支持 CUDA，当前设备 {device}，跳过")
+        return
+
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    logger.info("已开启 TF32 matmul/cuDNN")
+
+
+def _resolve_fp16(kwargs):
+    """FUNASR_TEST_FP16=1 且目标设备为 CUDA 时补上 fp16=True（作为缓存 key 的一部分）"""
+    if os.environ.get("FUNASR_TEST_FP16") != "1" or "fp16" in kwargs:
+        return kwargs
+
+    device = _resolve_device(kwargs.get("device"))
+    if not device.startswith("cuda"):
+        logger.warning(f"FUNASR_TEST_FP16=1 仅支持 CUDA，当前设备 {device}，使用 FP32")
+        return kwargs
+    return {**kwargs, "fp16": True}
+
+
+def get_model(**kwargs):
+    """获取（必要时加载）与 kwargs 对应的 AutoModel 实例"""
+    kwargs = _resolve_fp16(kwargs)
+    return _build(tuple(sorted(kwargs.items())))
+
+
+def cache_hits():
+    """get_model 至今命中缓存的次数；调用前后比较即可知道某次 get_model 是否复用了已加载模型"""
+    return _build.cache_info().hits
+
+
+def without_spk(model):
+    """
+    返回去掉说话人模型的浅拷贝，与原实例共享 ASR/VAD/punc 权重
+
+    FunASR 按实例属性 spk_model 决定是否做说话人聚类（generate 不支持按调用关闭），
+    浅拷贝后置空即可得到"不含说话人识别"的流水线，无需再加载一套模型。
+    """
+    view = copy.copy(model)
+    view.spk_model = None
+    view.spk_kwargs = None
+    return view
+
+
+def _file_md5(path):
+    """分块计算文件 MD5（与服务端 file_hash 口径一致）"""
+    hash_md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
+
+
+def cached_generate(model_kwargs, input, **generate_kwargs):
+    """
+    model.generate 的结果缓存版本
+
+    未设置 FUNASR_TEST_RESULT_CACHE 时等价于 get_model(**model_kwargs).generate(...)。
+
+    Args:
+        model_kwargs: 传给 get_model 的模型初始化参数
+        input: 音频文件路径
+        **generate_kwargs: 传给 model.generate 的参数
+    """
+    cache_dir = os.environ.get("FUNASR_TEST_RESULT_CACHE")
+    if not cache_dir:
+        return get_model(**model_kwargs).generate(input=input, **generate_kwargs)
+
+    # 键要覆盖所有会改变结果的加载条件：get_model 实际使用的参数（含 FP16 补上的 fp16）、
+    # 解析后的设备以及量化/TF32 开关，否则 int8/fp16 的结果会被之后的 FP32 运行命中
+    effective_kwargs = _resolve_fp16(model_kwargs)
+    key_source = repr((
+        _file_md5(input),
+        sorted(effective_kwargs.items()),
+        _resolve_device(effective_kwargs.get("device")),
+        os.environ.get("FUNASR_TEST_QUANT") == "1",
+        os.environ.get("FUNASR_TEST_TF32") == "1",
+        sorted(generate_kwargs.items()),
+    ))
+    cache_path = Path(cache_dir) / f"{hashlib.md5(key_source.encode('utf-8')).hexdigest()}.pkl"
+
+    if cache_path.exists():
+        logger.info(f"命中结果缓存: {cache_path.name} ({os.path.basename(input)})")
+        return pickle.loads(cache_path.read_bytes())
+
+    result = get_model(**model_kwargs).generate(input=input, **generate_kwargs)
+
+    # 先写临时文件再原子替换，中断时不会留下半截缓存
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".tmp{os.getpid()}")
+    tmp_path.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp_path, cache_path)
+    return result
+
+
+def warm_model(model):
+    """
+    用短语音跑一次 generate，把首次推理的一次性开销（权重搬运、kernel 初始化、
+    线程池启动等）挪到计时之外；同一实例重复调用直接返回
+    """
+    if id(model) in _warmed_models:
+        return
+
+    logger.info(f"预热模型: {WARMUP_AUDIO.name}")
+    model.generate(input=str(WARMUP_AUDIO), batch_size_s=300, hotword='')
+    _warmed_models.add(id(model))
+
+
+def clear_models():
+    """
+    释放所有缓存的模型
+
+    测量内存/CPU 的基准脚本在切换配置前调用，保证同一时刻只有当前配置的流水线常驻。
+    """
+    _warmed_models.clear()
+    _build.cache_clear()
+    gc.collect()
+
+
+@atexit.register
+def _release_models():
+    """进程退出前释放模型引用，让 GPU/MPS 显存尽早回收"""
+    clear_models()
@@ -7,14 +7,29 @@
 import os
 import sys
 import time
-import json
 from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from funasr import AutoModel
+from tests.manual._json_io import dumps_json
+from tests.manual._model_cache import get_model
+
+# FUNASR_TEST_VERBOSE=1 时打印完整结果 JSON，默认只打印一行摘要
+VERBOSE = os.getenv("FUNASR_TEST_VERBOSE") == "1"
+
+
+def _print_result(result):
+    """打印结果：默认一行摘要，长音频的完整结果可达 MB 级，仅 VERBOSE 时整体输出"""
+    print(f"结果类型: {type(result)}")
+    if VERBOSE:
+        print(f"结果内容: {dumps_json(result).decode('utf-8')}")
+        return
+
+    data = result[0] if isinstance(result, list) and result else {}
+    print(f"结果摘要: text={len(data.get('text', ''))} chars, "
+          f"sentences={len(data.get('sentence_info', []))}")
 
 
 def test_direct_method():
@@ -24,7 +39,7 @@ def test_direct_method():
     audio_path = project_root / "samples" / "spk_extract.mp3"
     
     print("加载FunASR完整模型（包含说话人识别）...")
-    model = AutoModel(
+    model = get_model(
         model="paraformer-zh", 
         model_revision="v2.0.4",
         vad_model="fsmn-vad", 
@@ -37,13 +52,12 @@ def test_direct_method():
     
     print("开始转录...")
     result = model.generate(
-        input=str(audio_path), 
+        input=str(audio_path),  # 与生产转录器一致，传文件路径由 FunASR 自行加载
         batch_size_s=300, 
         hotword=''
     )
     
-    print(f"结果类型: {type(result)}")
-    print(f"结果内容: {json.dumps(result, ensure_ascii=False, indent=2)}")
+    _print_result(result)
     
     return result
 
@@ -55,7 +69,7 @@ def test_cached_method():
     audio_path = project_root / "samples" / "spk_extract.mp3"
     
     print("加载FunASR完整模型（使用缓存）...")
-    model = AutoModel(
+    model = get_model(
         model="paraformer-zh", 
         model_revision="v2.0.4",
         vad_model="fsmn-vad", 
@@ -73,13 +87,12 @@ def test_cached_method():
     
     print("开始转录...")
     result = model.generate(
-        input=str(audio_path), 
+        input=str(audio_path),  # 与生产转录器一致，传文件路径由 FunASR 自行加载
         batch_size_s=300, 
         hotword=''
     )
     
-    print(f"结果类型: {type(result)}")
-    print(f"结果内容: {json.dumps(result, ensure_ascii=False, indent=2)}")
+    _print_result(result)
     
     return result
 
@@ -8,6 +8,7 @@
 
 import json
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -27,10 +28,20 @@ def merge_speaker_sentences(sentence_info: List[Dict[str, Any]]) -> List[Dict[st
     
     merged_sentences = []
     current_speaker = None
-    current_text = ""
+    current_parts = []  # 当前说话人段落的文本片段，段落结束时一次 join，避免逐句 += 的二次方拷贝
     current_start_time = None
     current_end_time = None
     
+    def flush():
+        if current_parts:
+            merged_sentences.append({
+                "speaker": current_speaker,
+                "text": "".join(current_parts),
+                "start_time": round(current_start_time / 1000, 2),  # 转换为秒
+                "end_time": round(current_end_time / 1000, 2),     # 转换为秒
+                "duration": round((current_end_time - current_start_time) / 1000, 2)
+            })
+    
     for sentence in sentence_info:
         speaker = sentence.get('spk', 'Unknown')
         text = sentence.get('text', '').strip()
@@ -40,34 +51,20 @@ def merge_speaker_sentences(sentence_info: List[Dict[str, Any]]) -> List[Dict[st
         if text:  # 忽略空文本
             if speaker == current_speaker:
                 # 相同说话人，合并文本并更新结束时间
-                current_text += text
+                current_parts.append(text)
                 current_end_time = end_ms  # 更新为最新的结束时间
             else:
                 # 不同说话人，保存前一个说话人的合并文本
-                if current_text:
-                    merged_sentences.append({
-                        "speaker": current_speaker,
-                        "text": current_text,
-                        "start_time": round(current_start_time / 1000, 2),  # 转换为秒
-                        "end_time": round(current_end_time / 1000, 2),     # 转换为秒
-                        "duration": round((current_end_time - current_start_time) / 1000, 2)
-                    })
+                flush()
                 
                 # 开始新的说话人段落
                 current_speaker = speaker
-                current_text = text
+                current_parts = [text]
                 current_start_time = start_ms
                 current_end_time = end_ms
     
     # 添加最后一个说话人的文本
-    if current_text:
-        merged_sentences.append({
-            "speaker": current_speaker,
-            "text": current_text,
-            "start_time": round(current_start_time / 1000, 2),  # 转换为秒
-            "end_time": round(current_end_time / 1000, 2),     # 转换为秒
-            "duration": round((current_end_time - current_start_time) / 1000, 2)
-        })
+    flush()
     
     return merged_sentences
 
@@ -95,10 +92,7 @@ def generate_sentence_level_transcription(transcription_result: Dict[str, Any])
     merged_sentences = merge_speaker_sentences(sentence_info)
     
     # 统计说话人信息
-    speakers = {}
-    for sentence in merged_sentences:
-        speaker = str(sentence['speaker'])
-        speakers[speaker] = speakers.get(speaker, 0) + 1
+    speakers = dict(Counter(str(sentence['speaker']) for sentence in merged_sentences))
     
     # 生成最终输出结构
     result = {
@@ -7,6 +7,7 @@
 import os
 import sys
 import time
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
@@ -14,7 +15,12 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from funasr import AutoModel
+from tests.manual._audio_files import list_audio
+from tests.manual._json_io import dump_json
+from tests.manual._model_cache import cached_generate
+
+# FUNASR_TEST_VERBOSE=1 时打印完整结果 JSON；长音频的完整结果可达 MB 级，默认只打印摘要
+VERBOSE = os.getenv("FUNASR_TEST_VERBOSE") == "1"
 
 
 def transcribe_audio(audio_path):
@@ -29,9 +35,8 @@ def transcribe_audio(audio_path):
     """
     print(f"正在处理音频文件: {audio_path}")
     
-    # 创建带说话人识别的完整模型（参考官方示例）
-    print("加载FunASR完整模型（包含说话人识别）...")
-    model = AutoModel(
+    # 带说话人识别的完整模型（参考官方示例），同一进程内只加载一次
+    model_kwargs = dict(
         model="paraformer-zh", 
         model_revision="v2.0.4",
         vad_model="fsmn-vad", 
@@ -42,10 +47,11 @@ def transcribe_audio(audio_path):
         spk_model_revision="v2.0.2",
     )
     
-    # 执行转录
+    # 执行转录（设置 FUNASR_TEST_RESULT_CACHE 时同一文件的结果直接复用）
     print("开始转录...")
-    result = model.generate(
-        input=audio_path, 
+    result = cached_generate(
+        model_kwargs,
+        input=str(audio_path), 
         batch_size_s=300, 
         hotword=''  # 可以添加热词
     )
@@ -58,13 +64,8 @@ def main():
     # 查找音频文件
     samples_dir = project_root / "samples"
     
-    # 支持的音频格式
-    audio_formats = ['.wav', '.mp3', '.mp4', '.m4a', '.flac']
-    
-    # 查找音频文件
-    audio_files = []
-    for fmt in audio_formats:
-        audio_files.extend(samples_dir.glob(f"*{fmt}"))
+    # 查找音频文件（wav/mp3/mp4/m4a/flac）
+    audio_files = list_audio(samples_dir)
     
     if not audio_files:
         print("错误: 在 samples 文件夹中没有找到音频文件")
@@ -85,9 +86,10 @@ def main():
             print("=" * 60)
             
             # 显示完整的结果结构
-            import json
-            print("完整转录结果:")
-            print(json.dumps(result, ensure_ascii=False, indent=2))
+            if VERBOSE:
+                from tests.manual._json_io import dumps_json
+                print("完整转录结果:")
+                print(dumps_json(result).decode("utf-8"))
             
             # 解析并显示关键信息
             if isinstance(result, list) and len(result) > 0:
@@ -106,21 +108,19 @@ def main():
                     sentences = data['sentence_info']
                     print(f"- 句子信息: {len(sentences)} 句")
                     
-                    # 检查是否有说话人信息
-                    speakers = set()
-                    for sent in sentences:
-                        if 'spk' in sent:
-                            speakers.add(sent['spk'])
+                    # 说话人句数统计交给 Counter，预览只取前3句
+                    speakers = Counter(sent['spk'] for sent in sentences if 'spk' in sent)
+                    preview = [
+                        f"  {i}. [{sent.get('spk', 'Unknown')}] "
+                        f"{sent.get('start', 0)}ms-{sent.get('end', 0)}ms: {sent.get('text', '')}"
+                        for i, sent in enumerate(sentences[:3], 1)
+                    ]
                     
                     if speakers:
                         print(f"- 检测到说话人: {list(speakers)}")
+                        print(f"- 说话人句数: {speakers.most_common()}")
                         print("\n前3句详细信息:")
-                        for i, sent in enumerate(sentences[:3]):
-                            spk = sent.get('spk', 'Unknown')
-                            text = sent.get('text', '')
-                            start = sent.get('start', 0)
-                            end = sent.get('end', 0)
-                            print(f"  {i+1}. [{spk}] {start}ms-{end}ms: {text}")
+                        print("\n".join(preview))
                     else:
                         print("- 未检测到说话人信息")
                 
@@ -183,14 +183,8 @@ def main():
                         sentences = data['sentence_info']
                         export_data["analysis"]["sentence_count"] = len(sentences)
                         
-                        # 提取说话人信息
-                        speakers = {}
-                        speaker_list = []
-                        for sent in sentences:
-                            if 'spk' in sent:
-                                spk = sent['spk']
-                                speaker_list.append(spk)
-                                speakers[str(spk)] = speakers.get(str(spk), 0) + 1
+                        # 提取说话人信息（每个说话人的句子数）
+                        speakers = dict(Counter(str(sent['spk']) for sent in sentences if 'spk' in sent))
                         
                         export_data["analysis"]["speakers"] = {
                             "detected_speakers": list(speakers.keys()),
@@ -219,8 +213,7 @@ def main():
                         export_data["analysis"]["timestamp_sample"] = timestamps[:5] if len(timestamps) > 5 else timestamps
                 
                 # 保存JSON文件
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(export_data, f, ensure_ascii=False, indent=2)
+                dump_json(export_data, output_path)
                 
                 print(f"\n[OK] 转录结果已导出到: {output_filename}")
                 print(f"  完整路径: {output_path}")
@@ -7,16 +7,20 @@
 import os
 import sys
 import asyncio
-import json
-import time
 from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # 导入要测试的转录器
 from src.core.funasr_transcriber import FunASRTranscriber
+from tests.manual._audio_files import list_audio, probe_duration
+from tests.manual._json_io import dump_json
+
+
+# 同时进行的转录任务上限，限制显存/内存占用
+MAX_CONCURRENT_FILES = 4
 
 
 async def test_transcriber():
@@ -25,119 +29,142 @@ async def test_transcriber():
     
     # 查找音频文件
     samples_dir = project_root / "samples"
-    audio_files = []
-    for ext in ['.wav', '.mp3', '.mp4', '.m4a', '.flac']:
-        audio_files.extend(samples_dir.glob(f"*{ext}"))
+    audio_files = list_audio(samples_dir)
     
     if not audio_files:
         print("错误: 在 samples 文件夹中没有找到音频文件")
         return
     
+    # 只读文件头拿到时长，按时长从短到长提交，短文件的结果先出来
+    audio_files.sort(key=lambda p: probe_duration(str(p)))
+    
     # 创建转录器实例
     transcriber = FunASRTranscriber()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILES)
     
-    for i, audio_file in enumerate(audio_files, 1):
-        print(f"\n=== 测试文件 {i}/{len(audio_files)}: {audio_file.name} ===")
-        
-        try:
-            start_time = time.time()
+    async def _run(i, audio_file):
+        """转录单个文件，返回 (序号, 文件, 结果或异常)"""
+        async with semaphore:
+            print(f"\n=== 开始测试文件 {i}/{len(audio_files)}: {audio_file.name} "
+                  f"({probe_duration(str(audio_file)):.2f}秒) ===")
             
-            # 进度回调函数
+            # 进度回调函数（并发时带上文件名区分）
             def progress_callback(progress):
-                print(f"进度: {progress}%")
-            
-            # 调用转录
-            result = await transcriber.transcribe(
-                audio_path=str(audio_file),
-                task_id=f"test-{i}",
-                progress_callback=progress_callback,
-                enable_speaker=True
-            )
-            
-            processing_time = time.time() - start_time
-            
-            # 显示结果
-            print(f"\n转录结果:")
-            print(f"- 任务ID: {result.task_id}")
-            print(f"- 文件名: {result.file_name}")
-            print(f"- 文件哈希: {result.file_hash}")
-            print(f"- 音频时长: {result.duration:.2f}秒")
-            print(f"- 处理时间: {result.processing_time:.2f}秒")
-            print(f"- 检测到说话人: {result.speakers}")
-            print(f"- 转录片段数: {len(result.segments)}")
-            
-            # 显示转录片段
-            print(f"\n转录片段详情:")
-            for j, segment in enumerate(result.segments[:5]):  # 只显示前5个片段
-                print(f"  {j+1}. [{segment.speaker}] {segment.start_time}s-{segment.end_time}s: {segment.text}")
-            
-            if len(result.segments) > 5:
-                print(f"  ... 还有 {len(result.segments) - 5} 个片段")
+                print(f"[{audio_file.name}] 进度: {progress}%")
             
-            # 保存结果到JSON文件
-            output_data = {
-                "task_id": result.task_id,
-                "file_name": result.file_name,
-                "file_hash": result.file_hash,
-                "duration": result.duration,
-                "processing_time": result.processing_time,
-                "speakers": result.speakers,
-                "segments": [
-                    {
-                        "start_time": seg.start_time,
-                        "end_time": seg.end_time,
-                        "text": seg.text,
-                        "speaker": seg.speaker,
-                        "duration": round(seg.end_time - seg.start_time, 2)
-                    }
-                    for seg in result.segments
-                ],
-                "transcription_summary": {
-                    "total_speakers": len(result.speakers),
-                    "total_segments": len(result.segments),
-                    "full_text": " ".join([seg.text for seg in result.segments])
-                }
-            }
-            
-            # 保存到文件
-            output_filename = f"core_test_result_{audio_file.stem}.json"
-            output_path = project_root / "tests" / "output" / output_filename
-            output_path.parent.mkdir(exist_ok=True)
-            
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"\n[OK] 测试结果已保存到: {output_filename}")
-            print(f"  完整路径: {output_path}")
-            
-            # 验证结果质量
-            print(f"\n结果验证:")
-            if len(result.segments) > 0:
-                print(f"[OK] 成功生成 {len(result.segments)} 个转录片段")
-            else:
-                print("[WARN] 警告: 没有生成任何转录片段")
-            
-            if len(result.speakers) > 1:
-                print(f"[OK] 成功识别 {len(result.speakers)} 个说话人")
-            else:
-                print(f"[INFO] 只识别到 {len(result.speakers)} 个说话人")
-            
-            total_text = " ".join([seg.text for seg in result.segments])
-            if len(total_text) > 10:
-                print(f"[OK] 转录文本长度: {len(total_text)} 字符")
-            else:
-                print("[WARN] 警告: 转录文本过短")
-            
-        except Exception as e:
-            print(f"[ERROR] 测试失败: {e}")
+            try:
+                result = await transcriber.transcribe(
+                    audio_path=str(audio_file),
+                    task_id=f"test-{i}",
+                    progress_callback=progress_callback,
+                    enable_speaker=True
+                )
+                return i, audio_file, result
+            except Exception as e:
+                return i, audio_file, e
+    
+    # 文件间的预处理/后处理与推理重叠，按完成顺序输出结果
+    tasks = [_run(i, audio_file) for i, audio_file in enumerate(audio_files, 1)]
+    for next_done in asyncio.as_completed(tasks):
+        i, audio_file, result = await next_done
+        print(f"\n=== 测试文件 {i}/{len(audio_files)}: {audio_file.name} ===")
+        
+        if isinstance(result, Exception):
+            print(f"[ERROR] 测试失败: {result}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(type(result), result, result.__traceback__)
+        else:
+            _report_result(result, audio_file)
         
         print("-" * 60)
     
     print("\n=== 测试完成 ===")
 
 
+def _report_result(result, audio_file):
+    """打印、保存并验证单个文件的转录结果"""
+    try:
+        # 显示结果
+        print(f"\n转录结果:")
+        print(f"- 任务ID: {result.task_id}")
+        print(f"- 文件名: {result.file_name}")
+        print(f"- 文件哈希: {result.file_hash}")
+        print(f"- 音频时长: {result.duration:.2f}秒")
+        print(f"- 处理时间: {result.processing_time:.2f}秒")
+        print(f"- 检测到说话人: {result.speakers}")
+        print(f"- 转录片段数: {len(result.segments)}")
+        
+        # 显示转录片段
+        print(f"\n转录片段详情:")
+        for j, segment in enumerate(result.segments[:5]):  # 只显示前5个片段
+            print(f"  {j+1}. [{segment.speaker}] {segment.start_time}s-{segment.end_time}s: {segment.text}")
+        
+        if len(result.segments) > 5:
+            print(f"  ... 还有 {len(result.segments) - 5} 个片段")
+        
+        # 一次遍历片段，同时生成导出列表和全文（保存与验证共用）
+        segments_out = []
+        text_parts = []
+        for seg in result.segments:
+            segments_out.append({
+                "start_time": seg.start_time,
+                "end_time": seg.end_time,
+                "text": seg.text,
+                "speaker": seg.speaker,
+                "duration": round(seg.end_time - seg.start_time, 2)
+            })
+            text_parts.append(seg.text)
+        total_text = " ".join(text_parts)
+        
+        # 保存结果到JSON文件
+        output_data = {
+            "task_id": result.task_id,
+            "file_name": result.file_name,
+            "file_hash": result.file_hash,
+            "duration": result.duration,
+            "processing_time": result.processing_time,
+            "speakers": result.speakers,
+            "segments": segments_out,
+            "transcription_summary": {
+                "total_speakers": len(result.speakers),
+                "total_segments": len(result.segments),
+                "full_text": total_text
+            }
+        }
+        
+        # 保存到文件
+        output_filename = f"core_test_result_{audio_file.stem}.json"
+        output_path = project_root / "tests" / "output" / output_filename
+        output_path.parent.mkdir(exist_ok=True)
+        
+        dump_json(output_data, output_path)
+        
+        print(f"\n[OK] 测试结果已保存到: {output_filename}")
+        print(f"  完整路径: {output_path}")
+        
+        # 验证结果质量
+        print(f"\n结果验证:")
+        if len(result.segments) > 0:
+            print(f"[OK] 成功生成 {len(result.segments)} 个转录片段")
+        else:
+            print("[WARN] 警告: 没有生成任何转录片段")
+        
+        if len(result.speakers) > 1:
+            print(f"[OK] 成功识别 {len(result.speakers)} 个说话人")
+        else:
+            print(f"[INFO] 只识别到 {len(result.speakers)} 个说话人")
+        
+        if len(total_text) > 10:
+            print(f"[OK] 转录文本长度: {len(total_text)} 字符")
+        else:
+            print("[WARN] 警告: 转录文本过短")
+        
+    except Exception as e:
+        print(f"[ERROR] 结果处理失败: {e}")
+        import traceback
+        traceback.print_exc()
+
+
 async def main():
     """主函数"""
     print("=" * 60)
@@ -6,15 +6,15 @@
 
 import os
 import sys
-import json
 from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.funasr_transcriber import FunASRTranscriber
 from src.models.schemas import TranscriptionSegment
+from tests.manual._json_io import dump_json
 
 
 def create_mock_funasr_result():
@@ -75,8 +75,10 @@ def test_merge_function():
     segments_merged = transcriber._parse_and_merge_segments(mock_result)
     
     print(f"   合并后片段数: {len(segments_merged)}")
-    for i, seg in enumerate(segments_merged):
-        print(f"   {i+1}. [{seg.speaker}] {seg.start_time}s-{seg.end_time}s ({seg.end_time-seg.start_time:.1f}s): {seg.text[:50]}...")
+    print("\n".join(
+        f"   {i}. [{seg.speaker}] {seg.start_time}s-{seg.end_time}s ({seg.end_time-seg.start_time:.1f}s): {seg.text[:50]}..."
+        for i, seg in enumerate(segments_merged, 1)
+    ))
     
     # 保存合并后的结果
     output_data = {
@@ -99,8 +101,7 @@ def test_merge_function():
     output_path = project_root / "tests" / "output" / "merge_test_result.json"
     output_path.parent.mkdir(exist_ok=True)
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    dump_json(output_data, output_path)
     
     print(f"\n[OK] 合并测试结果已保存到: merge_test_result.json")
     
@@ -5,15 +5,15 @@ import sys
 import os
 import asyncio
 import time
-from pathlib import Path
 from typing import List
 import threading
 
 # 添加项目根目录到系统路径
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 from loguru import logger
 from src.core.funasr_transcriber import FunASRTranscriber
+from tests.manual._audio_files import first_audio, list_audio
 
 
 async def test_single_transcribe(transcriber: FunASRTranscriber, audio_file: str, task_id: int):
@@ -86,7 +86,7 @@ async def test_concurrent_transcribe(audio_files: List[str], concurrency: int =
 
 async def test_with_different_modes():
     """测试不同的并发模式"""
-    import json
+    from src.core.config import config as global_config
     
     # 查找测试音频文件
     test_files = []
@@ -97,13 +97,7 @@ async def test_with_different_modes():
     ]
     
     for test_dir in test_dirs:
-        if os.path.exists(test_dir):
-            for file in Path(test_dir).glob("*.wav"):
-                test_files.append(str(file))
-            for file in Path(test_dir).glob("*.mp3"):
-                test_files.append(str(file))
-            for file in Path(test_dir).glob("*.m4a"):
-                test_files.append(str(file))
+        test_files.extend(str(file) for file in list_audio(test_dir, {'.wav', '.mp3', '.m4a'}))
     
     if not test_files:
         # 如果没有找到测试文件，创建一个静音测试文件
@@ -117,29 +111,22 @@ async def test_with_different_modes():
     logger.info("测试线程锁模式 (concurrency_mode: lock)")
     logger.info("=" * 60)
     
-    # 确保配置使用lock模式
-    config_path = "config.json"
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    # 确保使用lock模式：concurrency_mode 只由本进程的 FunASRTranscriber 读取，
+    # 直接改内存中的全局配置，不再读改写 config.json
+    original_mode = global_config.transcription.concurrency_mode
+    global_config.transcription.concurrency_mode = "lock"
     
-    original_mode = config["transcription"].get("concurrency_mode", "lock")
-    config["transcription"]["concurrency_mode"] = "lock"
-    
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
-    
-    # 运行测试
-    success = await test_concurrent_transcribe(test_files, concurrency=4)
+    try:
+        # 运行测试
+        success = await test_concurrent_transcribe(test_files, concurrency=4)
+    finally:
+        # 恢复原始配置
+        global_config.transcription.concurrency_mode = original_mode
     
     if success:
         logger.success("线程锁模式测试通过!")
     else:
         logger.error("线程锁模式测试失败!")
-    
-    # 恢复原始配置
-    config["transcription"]["concurrency_mode"] = original_mode
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
 
 
 async def stress_test():
@@ -153,17 +140,10 @@ async def stress_test():
     test_dirs = ["tests/data", "tests/samples", "uploads", "temp"]
     
     for test_dir in test_dirs:
-        if os.path.exists(test_dir):
-            for file in Path(test_dir).glob("*.wav"):
-                test_file = str(file)
-                break
-            if test_file:
-                break
-            for file in Path(test_dir).glob("*.mp3"):
-                test_file = str(file)
-                break
-            if test_file:
-                break
+        file = first_audio(test_dir, {'.wav', '.mp3'})
+        if file:
+            test_file = str(file)
+            break
     
     if not test_file:
         logger.warning("未找到测试音频文件，跳过压力测试")
@@ -59,7 +59,9 @@ def test_batch_size(audio_path: str, batch_size: int):
         DeviceManager.apply_patches(device)
         DeviceManager.log_device_selection(device, config_dict)
 
-        # 初始化模型
+        # 初始化模型：每轮都新建实例、直接读文件，且在 finally 中清掉 funasr 模块，
+        # 保证每个 batch_size_s 都在与线上相同的"全新加载 + 完整解码"条件下诊断，
+        # 不复用 _model_cache / decode_16k（跨轮残留的分配器状态和常驻波形会干扰结论）
         logger.info("初始化 FunASR 模型...")
         from funasr import AutoModel
 
@@ -14,7 +14,6 @@ import sys
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
-import json
 from datetime import datetime
 
 # 添加项目根目录到 Python 路径
@@ -23,6 +22,8 @@ sys.path.insert(0, str(project_root))
 
 from loguru import logger
 import psutil
+from tests.manual._audio_files import list_audio
+from tests.manual._json_io import dump_json
 
 # 配置日志（可通过环境变量设置为 DEBUG）
 log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -513,9 +514,7 @@ def main():
         return
 
     # 获取所有音频文件
-    audio_files = []
-    for ext in [".wav", ".mp3", ".m4a", ".flac"]:
-        audio_files.extend(test_dir.glob(f"*{ext}"))
+    audio_files = list_audio(test_dir, {".wav", ".mp3", ".m4a", ".flac"})
 
     if not audio_files:
         logger.error(f"未找到音频文件: {test_dir}")
@@ -539,8 +538,7 @@ def main():
 
     # 输出 JSON 数据（用于进一步分析）
     json_path = report_path.replace('.md', '.json')
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump([r.to_dict() for r in results], f, indent=2, ensure_ascii=False)
+    dump_json([r.to_dict() for r in results], json_path)
 
     logger.success(f"JSON 数据已保存: {json_path}")
 
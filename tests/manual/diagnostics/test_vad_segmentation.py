@@ -110,10 +110,7 @@ def test_with_vad_segmentation(audio_path: str, max_segment_time_ms: int):
                 logger.info(f"  - 第一段文本: {text[:80]}...")
 
                 # 统计说话人
-                speakers = set()
-                for item in result:
-                    if isinstance(item, dict) and "spk" in item:
-                        speakers.add(item["spk"])
+                speakers = {item["spk"] for item in result if isinstance(item, dict) and "spk" in item}
 
                 if speakers:
                     logger.info(f"  - 说话人数: {len(speakers)}")
@@ -20,8 +20,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from loguru import logger
-from funasr import AutoModel
-from src.utils.file_utils import get_audio_duration
+from tests.manual._json_io import dump_json
+from tests.manual._model_cache import clear_models, get_model, warm_model
+from tests.manual._audio_files import decode_16k, probe_duration
 
 
 class CPUOptimizationTester:
@@ -31,6 +32,7 @@ class CPUOptimizationTester:
         self.audio_file = audio_file
         self.config = self._load_config(config_path)
         self.results = []
+        self._model_kwargs = None  # 当前常驻模型的初始化参数
         
         # 系统信息
         self.system_info = {
@@ -47,12 +49,50 @@ class CPUOptimizationTester:
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def _get_model(self, device: str, ncpu: int = None):
+        """
+        获取共享的已预热模型：参数相同的测试（如多线程与两次分块测试）复用同一实例，
+        不再重复加载权重；首次推理开销在预热时付掉，不计入各测试的处理时间
+        """
+        funasr_config = self.config["funasr"]
+        kwargs = dict(
+            model=funasr_config["model"],
+            model_revision=funasr_config["model_revision"],
+            vad_model=funasr_config["vad_model"],
+            vad_model_revision=funasr_config["vad_model_revision"],
+            punc_model=funasr_config["punc_model"],
+            punc_model_revision=funasr_config["punc_model_revision"],
+            spk_model=funasr_config["spk_model"],
+            spk_model_revision=funasr_config["spk_model_revision"],
+            cache_dir=funasr_config["model_dir"],
+            device=device,
+            disable_update=True,
+            disable_pbar=True,
+        )
+        if ncpu is not None:
+            kwargs["ncpu"] = ncpu
+        
+        # 只让当前配置的流水线常驻：换配置（线程数/设备）前先释放上一套，
+        # 否则多套模型同时驻留会抬高 RSS，影响本脚本报告的内存/CPU 数据
+        if kwargs != self._model_kwargs:
+            clear_models()
+            self._model_kwargs = kwargs
+        model = get_model(**kwargs)
+        
+        # AutoModel 只在初始化时调用 torch.set_num_threads(ncpu)，复用缓存实例时需按本次测试重新设置
+        if ncpu is not None:
+            import torch
+            torch.set_num_threads(ncpu)
+        
+        warm_model(model)
+        return model
+    
     def monitor_cpu_usage(self, duration: float) -> Tuple[float, float, List[float]]:
         """监控CPU使用率"""
         cpu_percentages = []
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        while time.time() - start_time < duration:
+        while time.perf_counter() - start_time < duration:
             cpu_percent = psutil.cpu_percent(interval=0.5)
             cpu_percentages.append(cpu_percent)
         
@@ -66,24 +106,13 @@ class CPUOptimizationTester:
         logger.info("\n=== 测试单线程性能 ===")
         
         # 初始化模型
-        model = AutoModel(
-            model=self.config["funasr"]["model"],
-            model_revision=self.config["funasr"]["model_revision"],
-            vad_model=self.config["funasr"]["vad_model"],
-            vad_model_revision=self.config["funasr"]["vad_model_revision"],
-            punc_model=self.config["funasr"]["punc_model"],
-            punc_model_revision=self.config["funasr"]["punc_model_revision"],
-            spk_model=self.config["funasr"]["spk_model"],
-            spk_model_revision=self.config["funasr"]["spk_model_revision"],
-            cache_dir=self.config["funasr"]["model_dir"],
-            device="cpu",
-            disable_update=True,
-            disable_pbar=True,
-            ncpu=1  # 单线程
-        )
+        model = self._get_model(device="cpu", ncpu=1)  # 单线程
         
         # 获取音频时长
-        audio_duration = get_audio_duration(self.audio_file)
+        audio_duration = probe_duration(self.audio_file)
+        
+        # 各场景共用同一份 16k 解码结果，计时只包含推理
+        audio_input = decode_16k(self.audio_file)
         logger.info(f"音频文件: {self.audio_file}, 时长: {audio_duration:.2f}秒")
         
         # 开始监控CPU
@@ -106,13 +135,13 @@ class CPUOptimizationTester:
         cpu_thread.start()
         
         # 执行转录
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = model.generate(
-            input=self.audio_file,
+            input=audio_input,
             batch_size_s=self.config["funasr"]["batch_size_s"],
             hotword=''
         )
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         # 停止CPU监控
         cpu_monitor_stop.set()
@@ -143,24 +172,13 @@ class CPUOptimizationTester:
         logger.info(f"\n=== 测试多线程性能 (线程数: {num_threads}) ===")
         
         # 初始化模型
-        model = AutoModel(
-            model=self.config["funasr"]["model"],
-            model_revision=self.config["funasr"]["model_revision"],
-            vad_model=self.config["funasr"]["vad_model"],
-            vad_model_revision=self.config["funasr"]["vad_model_revision"],
-            punc_model=self.config["funasr"]["punc_model"],
-            punc_model_revision=self.config["funasr"]["punc_model_revision"],
-            spk_model=self.config["funasr"]["spk_model"],
-            spk_model_revision=self.config["funasr"]["spk_model_revision"],
-            cache_dir=self.config["funasr"]["model_dir"],
-            device="cpu",
-            disable_update=True,
-            disable_pbar=True,
-            ncpu=num_threads  # 多线程
-        )
+        model = self._get_model(device="cpu", ncpu=num_threads)  # 多线程
         
         # 获取音频时长
-        audio_duration = get_audio_duration(self.audio_file)
+        audio_duration = probe_duration(self.audio_file)
+        
+        # 各场景共用同一份 16k 解码结果，计时只包含推理
+        audio_input = decode_16k(self.audio_file)
         
         # 开始监控CPU
         import threading
@@ -182,13 +200,13 @@ class CPUOptimizationTester:
         cpu_thread.start()
         
         # 执行转录
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = model.generate(
-            input=self.audio_file,
+            input=audio_input,
             batch_size_s=self.config["funasr"]["batch_size_s"],
             hotword=''
         )
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         # 停止CPU监控
         cpu_monitor_stop.set()
@@ -216,24 +234,13 @@ class CPUOptimizationTester:
         logger.info(f"\n=== 测试分块处理性能 (块大小: {chunk_size}秒) ===")
         
         # 初始化模型
-        model = AutoModel(
-            model=self.config["funasr"]["model"],
-            model_revision=self.config["funasr"]["model_revision"],
-            vad_model=self.config["funasr"]["vad_model"],
-            vad_model_revision=self.config["funasr"]["vad_model_revision"],
-            punc_model=self.config["funasr"]["punc_model"],
-            punc_model_revision=self.config["funasr"]["punc_model_revision"],
-            spk_model=self.config["funasr"]["spk_model"],
-            spk_model_revision=self.config["funasr"]["spk_model_revision"],
-            cache_dir=self.config["funasr"]["model_dir"],
-            device="cpu",
-            disable_update=True,
-            disable_pbar=True,
-            ncpu=mp.cpu_count()
-        )
+        model = self._get_model(device="cpu", ncpu=mp.cpu_count())
         
         # 获取音频时长
-        audio_duration = get_audio_duration(self.audio_file)
+        audio_duration = probe_duration(self.audio_file)
+        
+        # 各场景共用同一份 16k 解码结果，计时只包含推理
+        audio_input = decode_16k(self.audio_file)
         
         # 开始监控CPU
         import threading
@@ -255,13 +262,13 @@ class CPUOptimizationTester:
         cpu_thread.start()
         
         # 执行转录（使用较小的batch_size_s来模拟分块）
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = model.generate(
-            input=self.audio_file,
+            input=audio_input,
             batch_size_s=chunk_size,  # 使用较小的批次大小
             hotword=''
         )
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         # 停止CPU监控
         cpu_monitor_stop.set()
@@ -301,23 +308,13 @@ class CPUOptimizationTester:
         
         try:
             # 初始化模型
-            model = AutoModel(
-                model=self.config["funasr"]["model"],
-                model_revision=self.config["funasr"]["model_revision"],
-                vad_model=self.config["funasr"]["vad_model"],
-                vad_model_revision=self.config["funasr"]["vad_model_revision"],
-                punc_model=self.config["funasr"]["punc_model"],
-                punc_model_revision=self.config["funasr"]["punc_model_revision"],
-                spk_model=self.config["funasr"]["spk_model"],
-                spk_model_revision=self.config["funasr"]["spk_model_revision"],
-                cache_dir=self.config["funasr"]["model_dir"],
-                device=device,  # 使用GPU
-                disable_update=True,
-                disable_pbar=True
-            )
+            model = self._get_model(device=device)  # 使用GPU
             
             # 获取音频时长
-            audio_duration = get_audio_duration(self.audio_file)
+            audio_duration = probe_duration(self.audio_file)
+            
+            # 各场景共用同一份 16k 解码结果，计时只包含推理
+            audio_input = decode_16k(self.audio_file)
             
             # 开始监控CPU
             import threading
@@ -339,13 +336,13 @@ class CPUOptimizationTester:
             cpu_thread.start()
             
             # 执行转录
-            start_time = time.time()
+            start_time = time.perf_counter()
             result = model.generate(
-                input=self.audio_file,
+                input=audio_input,
                 batch_size_s=self.config["funasr"]["batch_size_s"],
                 hotword=''
             )
-            end_time = time.time()
+            end_time = time.perf_counter()
             
             # 停止CPU监控
             cpu_monitor_stop.set()
@@ -413,8 +410,7 @@ class CPUOptimizationTester:
         report_dir.mkdir(parents=True, exist_ok=True)
         
         report_file = report_dir / f"cpu_optimization_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        dump_json(report, report_file)
         
         logger.info(f"报告已保存到: {report_file}")
         
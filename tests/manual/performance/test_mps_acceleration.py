@@ -14,6 +14,8 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from loguru import logger
+from tests.manual._audio_files import decode_16k, probe_duration
+from tests.manual._model_cache import cache_hits, get_model, without_spk
 
 # 配置日志
 logger.remove()
@@ -183,22 +185,6 @@ def patch_funasr_mps_support():
     logger.success("✅ FunASR MPS 支持补丁已应用")
 
 
-def get_audio_duration(audio_path: str) -> float:
-    """获取音频时长"""
-    import subprocess
-    try:
-        result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-             '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
-            capture_output=True,
-            text=True
-        )
-        return float(result.stdout.strip())
-    except Exception as e:
-        logger.error(f"获取音频时长失败: {e}")
-        return 0
-
-
 def test_device_performance(audio_path: str, device: str, use_speaker: bool = True):
     """
     测试指定设备的性能
@@ -208,8 +194,6 @@ def test_device_performance(audio_path: str, device: str, use_speaker: bool = Tr
         device: 设备类型 (cpu, mps, cuda)
         use_speaker: 是否启用说话人识别
     """
-    from funasr import AutoModel
-
     logger.info(f"\n{'='*60}")
     logger.info(f"测试设备: {device.upper()}")
     logger.info(f"说话人识别: {'启用' if use_speaker else '禁用'}")
@@ -221,45 +205,51 @@ def test_device_performance(audio_path: str, device: str, use_speaker: bool = Tr
             logger.error(f"音频文件不存在: {audio_path}")
             return None
 
-        audio_duration = get_audio_duration(audio_path)
+        audio_duration = probe_duration(audio_path)  # 多轮测试同一文件，只探测一次
         logger.info(f"音频文件: {os.path.basename(audio_path)}")
         logger.info(f"音频时长: {audio_duration:.2f} 秒")
 
+        # 解码一次，4 组设备/配置 × (预热 + 3 轮) 共用同一份 16k 波形，计时只包含推理
+        audio_input = decode_16k(audio_path)
+
         # 初始化模型
         logger.info(f"正在初始化模型...")
-        start_init = time.time()
+        hits_before = cache_hits()
+        start_init = time.perf_counter()
+
+        # 仅 ASR 模型（不含说话人识别）的参数；完整模型在此基础上加 cam++
+        asr_kwargs = dict(
+            model="paraformer-zh",
+            model_revision="v2.0.4",
+            vad_model="fsmn-vad",
+            vad_model_revision="v2.0.4",
+            punc_model="ct-punc-c",
+            punc_model_revision="v2.0.4",
+            device=device,
+            disable_update=True,
+            disable_pbar=True
+        )
+        full_kwargs = dict(asr_kwargs, spk_model="cam++", spk_model_revision="v2.0.2")
 
         if use_speaker:
             # 包含说话人识别的完整模型
-            model = AutoModel(
-                model="paraformer-zh",
-                model_revision="v2.0.4",
-                vad_model="fsmn-vad",
-                vad_model_revision="v2.0.4",
-                punc_model="ct-punc-c",
-                punc_model_revision="v2.0.4",
-                spk_model="cam++",
-                spk_model_revision="v2.0.2",
-                device=device,
-                disable_update=True,
-                disable_pbar=True
-            )
+            model = get_model(**full_kwargs)
         else:
-            # 仅 ASR 模型（不含说话人识别）
-            model = AutoModel(
-                model="paraformer-zh",
-                model_revision="v2.0.4",
-                vad_model="fsmn-vad",
-                vad_model_revision="v2.0.4",
-                punc_model="ct-punc-c",
-                punc_model_revision="v2.0.4",
-                device=device,
-                disable_update=True,
-                disable_pbar=True
-            )
-
-        init_time = time.time() - start_init
-        logger.info(f"模型初始化耗时: {init_time:.2f} 秒")
+            # 同一设备的有/无说话人两组测试共用一套权重：无说话人时用完整模型去掉 spk 的浅拷贝；
+            # 说话人模型在该设备上加载失败时（如部分 MPS 环境）退回单独加载 ASR 模型
+            try:
+                model = without_spk(get_model(**full_kwargs))
+            except Exception as e:
+                logger.warning(f"完整模型加载失败，改为仅加载 ASR 模型: {e}")
+                model = get_model(**asr_kwargs)
+
+        init_time = time.perf_counter() - start_init
+        if cache_hits() > hits_before:
+            # 复用了同设备上一组测试加载的模型，这里的耗时不是初始化时间，不记录
+            init_time = None
+            logger.info("模型初始化耗时: 不适用（同设备第二组测试复用已加载模型）")
+        else:
+            logger.info(f"模型初始化耗时: {init_time:.2f} 秒")
 
         # 检查实际使用的设备
         actual_device = next(model.model.parameters()).device
@@ -267,16 +257,16 @@ def test_device_performance(audio_path: str, device: str, use_speaker: bool = Tr
 
         # 预热（第一次运行可能较慢）
         logger.info("预热中...")
-        _ = model.generate(input=audio_path, batch_size_s=300, hotword='')
+        _ = model.generate(input=audio_input, batch_size_s=300, hotword='')
 
         # 正式测试（运行3次取平均值）
         logger.info("开始性能测试...")
         inference_times = []
 
         for i in range(3):
-            start_time = time.time()
-            result = model.generate(input=audio_path, batch_size_s=300, hotword='')
-            inference_time = time.time() - start_time
+            start_time = time.perf_counter()
+            result = model.generate(input=audio_input, batch_size_s=300, hotword='')
+            inference_time = time.perf_counter() - start_time
             inference_times.append(inference_time)
 
             rtf = inference_time / audio_duration if audio_duration > 0 else 0
@@ -15,6 +15,8 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from loguru import logger
+from tests.manual._audio_files import probe_duration
+from tests.manual._json_io import dump_json
 
 # 配置日志
 logger.remove()
@@ -167,25 +169,9 @@ def patch_funasr_mps_support():
     logger.success("✅ FunASR MPS 支持补丁已应用")
 
 
-def get_audio_duration(audio_path: str) -> float:
-    """获取音频时长"""
-    import subprocess
-    try:
-        result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-             '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
-            capture_output=True,
-            text=True
-        )
-        return float(result.stdout.strip())
-    except:
-        return 0
-
-
 def quick_test(audio_path: str, device: str):
     """快速测试指定设备的性能（单次推理）"""
     from funasr import AutoModel
-    import json
 
     logger.info(f"\n{'='*60}")
     logger.info(f"测试设备: {device.upper()}")
@@ -196,13 +182,13 @@ def quick_test(audio_path: str, device: str):
             logger.error(f"音频文件不存在: {audio_path}")
             return None
 
-        audio_duration = get_audio_duration(audio_path)
+        audio_duration = probe_duration(audio_path)
         logger.info(f"音频文件: {os.path.basename(audio_path)}")
         logger.info(f"音频时长: {audio_duration:.2f} 秒")
 
         # 初始化完整模型（VAD + ASR + Speaker Diarization + Punctuation）
         logger.info(f"正在初始化完整模型（包含说话人识别）...")
-        start_init = time.time()
+        start_init = time.perf_counter()
 
         model = AutoModel(
             model="paraformer-zh",
@@ -218,7 +204,7 @@ def quick_test(audio_path: str, device: str):
             disable_pbar=False  # 显示进度条
         )
 
-        init_time = time.time() - start_init
+        init_time = time.perf_counter() - start_init
         logger.info(f"模型初始化耗时: {init_time:.2f} 秒")
 
         # 检查实际使用的设备
@@ -227,9 +213,9 @@ def quick_test(audio_path: str, device: str):
 
         # 单次推理测试
         logger.info("开始推理测试...")
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = model.generate(input=audio_path, batch_size_s=300, hotword='')
-        inference_time = time.time() - start_time
+        inference_time = time.perf_counter() - start_time
 
         rtf = inference_time / audio_duration if audio_duration > 0 else 0
 
@@ -251,8 +237,7 @@ def quick_test(audio_path: str, device: str):
 
             # 1. 保存完整 JSON 结果
             json_file = output_dir / f"transcription_{device}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
+            dump_json(result_data, json_file)
             logger.info(f"✅ 完整结果已保存: {json_file}")
 
             # 2. 保存纯文本
@@ -264,25 +249,25 @@ def quick_test(audio_path: str, device: str):
             # 3. 保存带时间戳和说话人信息的句子
             if 'sentence_info' in result_data:
                 sentences_file = output_dir / f"transcription_{device}_sentences.txt"
-                with open(sentences_file, 'w', encoding='utf-8') as f:
-                    for i, sent in enumerate(result_data['sentence_info'], 1):
-                        start_ms = sent.get('start', 0)
-                        end_ms = sent.get('end', 0)
-                        text = sent.get('text', '')
-
-                        # 提取说话人 - 转换为 Speaker1, Speaker2 格式
-                        speaker_id = sent.get('spk', 0)
-                        if isinstance(speaker_id, int):
-                            speaker = f"Speaker{speaker_id + 1}"
-                        else:
-                            speaker = "Speaker1"
-
-                        # 转换时间格式
-                        start_time = f"{start_ms//60000:02d}:{(start_ms%60000)//1000:02d}.{start_ms%1000:03d}"
-                        end_time = f"{end_ms//60000:02d}:{(end_ms%60000)//1000:02d}.{end_ms%1000:03d}"
-
-                        f.write(f"[{i}] {start_time} -> {end_time} | {speaker}\n")
-                        f.write(f"{text}\n\n")
+                # 先拼好所有句子块再一次写出
+                blocks = []
+                for i, sent in enumerate(result_data['sentence_info'], 1):
+                    start_ms = sent.get('start', 0)
+                    end_ms = sent.get('end', 0)
+
+                    # 提取说话人 - 转换为 Speaker1, Speaker2 格式
+                    speaker_id = sent.get('spk', 0)
+                    if isinstance(speaker_id, int):
+                        speaker = f"Speaker{speaker_id + 1}"
+                    else:
+                        speaker = "Speaker1"
+
+                    # 转换时间格式
+                    start_time = f"{start_ms//60000:02d}:{(start_ms%60000)//1000:02d}.{start_ms%1000:03d}"
+                    end_time = f"{end_ms//60000:02d}:{(end_ms%60000)//1000:02d}.{end_ms%1000:03d}"
+
+                    blocks.append(f"[{i}] {start_time} -> {end_time} | {speaker}\n{sent.get('text', '')}\n\n")
+                sentences_file.write_text("".join(blocks), encoding='utf-8')
                 logger.info(f"✅ 带时间戳和说话人信息已保存: {sentences_file}")
 
             logger.info(f"\n转录结果预览:\n{text[:200]}...\n")
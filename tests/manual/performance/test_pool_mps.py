@@ -10,7 +10,6 @@
 import os
 import sys
 import time
-import json
 import asyncio
 from pathlib import Path
 from datetime import datetime
@@ -54,10 +53,8 @@ def save_transcription_results(result, audio_file: Path, output_format: str):
     if output_format == "json":
         # 保存 JSON 格式
         output_file = OUTPUT_DIR / f"{base_name}_{timestamp}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # 使用 model_dump(mode='json') 来正确序列化 datetime 等类型
-            result_dict = result.model_dump(mode='json')
-            json.dump(result_dict, f, ensure_ascii=False, indent=2)
+        # model_dump_json 由 pydantic-core 直接序列化（含 datetime），不再先构造中间 dict
+        output_file.write_text(result.model_dump_json(indent=2), encoding='utf-8')
         logger.info(f"💾 已保存 JSON 结果: {output_file.name}")
     else:
         # 保存 SRT 格式
@@ -86,7 +83,7 @@ async def transcribe_single_file(transcriber, audio_file: Path, output_format: s
         return None
 
     logger.info(f"📁 开始转录: {audio_file.name} ({output_format.upper()} 格式)")
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         # 执行转录
@@ -98,7 +95,7 @@ async def transcribe_single_file(transcriber, audio_file: Path, output_format: s
             output_format=output_format
         )
 
-        transcribe_time = time.time() - start_time
+        transcribe_time = time.perf_counter() - start_time
 
         # 处理不同格式的返回值
         if output_format == "json":
@@ -267,9 +264,9 @@ async def test_concurrent_transcription():
     try:
         # 初始化（会启动 worker 进程）
         logger.info("\n🔧 初始化转录器（启动 worker 进程）...")
-        start_init = time.time()
+        start_init = time.perf_counter()
         await transcriber.initialize()
-        init_time = time.time() - start_init
+        init_time = time.perf_counter() - start_init
         logger.success(f"✅ 初始化完成，耗时: {init_time:.2f} 秒")
 
         # 等待一下，确保 worker 完全就绪
@@ -280,7 +277,7 @@ async def test_concurrent_transcription():
         logger.info("📝 开始并发转录...")
         logger.info("=" * 60)
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # 创建所有转录任务（同时转录 JSON 和 SRT 格式）
         tasks = []
@@ -291,7 +288,7 @@ async def test_concurrent_transcription():
         # 并发执行所有任务
         results = await asyncio.gather(*tasks)
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
 
         # 打印每个文件的结果
         logger.info("\n" + "=" * 60)
@@ -40,7 +40,7 @@ PODCAST = PROJECT_ROOT / "tests" / "fixtures" / "audio" / "podcast_2speakers_60s
 def file_hash(path: Path) -> str:
     h = hashlib.md5()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             h.update(chunk)
     return h.hexdigest()
 
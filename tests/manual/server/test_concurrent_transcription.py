@@ -28,6 +28,9 @@ import statistics
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from tests.manual._audio_files import list_audio, probe_duration
+from tests.manual._json_io import dump_json
+
 
 class ConcurrentClient:
     """并发测试客户端"""
@@ -98,7 +101,7 @@ class ConcurrentClient:
         """计算文件哈希"""
         hash_md5 = hashlib.md5()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(1 << 20), b""):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
     
@@ -447,10 +450,7 @@ class ConcurrentTranscriptionTester:
         
         # 查找测试音频文件
         samples_dir = project_root / "samples/concurrency"
-        audio_files = []
-        
-        for ext in ['.wav', '.mp3', '.mp4', '.m4a', '.flac']:
-            audio_files.extend(samples_dir.glob(f"*{ext}"))
+        audio_files = list_audio(samples_dir)
         
         if not audio_files:
             logger.error("未找到测试音频文件")
@@ -463,6 +463,10 @@ class ConcurrentTranscriptionTester:
             audio_files = audio_files * (self.num_clients // len(audio_files) + 1)
             audio_files = audio_files[:self.num_clients * 2]  # 每个客户端至少2个文件
         
+        # 长文件先提交：服务端按 FIFO 分配 worker，任务数多于 worker 时
+        # 避免长音频排在最后单独拖长总耗时（只读文件头，不解码）
+        audio_files.sort(key=lambda p: probe_duration(str(p)), reverse=True)
+        
         try:
             # 1. 设置客户端
             if not await self.setup_clients():
@@ -504,8 +508,7 @@ class ConcurrentTranscriptionTester:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = output_dir / f"{timestamp}_concurrent_test_report.json"
         
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        dump_json(report, output_file)
         
         logger.info(f"测试报告已保存: {output_file.name}")
         
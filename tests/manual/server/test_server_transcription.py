@@ -17,8 +17,10 @@ import json
 import time
 import asyncio
 import websockets
+import numpy as np
 import hashlib
 import base64
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
@@ -27,14 +29,47 @@ from loguru import logger
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from tests.manual._audio_files import AUDIO_EXTENSIONS, list_audio
+from tests.manual._json_io import dump_json, dumps_json_line
+
+
+# 同时在途（已上传、等待服务器转录）的任务数上限
+DEFAULT_MAX_INFLIGHT = 3
+
+# 按 task_id 路由到任务队列的消息类型；其余（upload_ready/upload_complete/error 等握手响应）走控制队列
+TASK_MESSAGE_TYPES = frozenset({
+    "task_progress", "transcription_progress", "task_complete", "transcription_complete",
+})
+
+# 进度消息从不作为握手响应，找不到任务队列时直接丢弃
+PROGRESS_MESSAGE_TYPES = frozenset({"task_progress", "transcription_progress"})
+
+# 文本总结的定宽行格式：文件名、音频时长、端到端耗时、说话人数、结果
+SUMMARY_LINE = "{file:40s} {dur:8.2f}s {ptime:8.2f}s spk={spk:<3d} {status}"
+
 
 class ServerTranscriptionTester:
-    """服务器转录测试器"""
+    """服务器转录测试器
+
+    单连接 send-ahead 流水线：上传握手（upload_request → upload_data → upload_complete）
+    由 _upload_lock 串行化，握手完成后即释放锁让下一个文件开始上传/计算哈希，
+    等待转录结果的阶段并发进行，最多 max_inflight 个任务同时在途。
+    连接上只有 _reader_task 一个读者，按 task_id 把进度/完成消息分发给对应任务。
+    """
     
-    def __init__(self, server_url="ws://localhost:8767"):
+    def __init__(self, server_url="ws://localhost:8767", max_inflight=DEFAULT_MAX_INFLIGHT):
         self.server_url = server_url
         self.websocket = None
-        self.test_results = []
+        self.test_results = []  # 精简记录（不含转录内容），仅用于总结统计
+        self._results_fp = None  # 逐条写入的 NDJSON 结果文件
+        self._results_path = None
+        self.max_inflight = max_inflight
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._upload_lock = asyncio.Lock()
+        self._reader_task = None
+        self._control_queue = asyncio.Queue()
+        self._task_queues = {}  # task_id -> asyncio.Queue
+        self._retired_tasks = set()  # 已结束（完成/超时/失败）的 task_id，其迟到消息直接丢弃
         
     async def connect_to_server(self):
         """连接到服务器"""
@@ -49,6 +84,9 @@ class ServerTranscriptionTester:
                 max_size=100 * 1024 * 1024  # 最大消息大小100MB
             )
             
+            # 启动唯一的读者任务，后续所有消息都经它分发
+            self._reader_task = asyncio.create_task(self._reader_loop())
+            
             # 接收服务器的连接确认消息
             welcome_message = await self.receive_message(timeout=10)
             if welcome_message.get("type") != "connected":
@@ -70,19 +108,71 @@ class ServerTranscriptionTester:
         if self.websocket:
             await self.websocket.close()
             logger.info("已断开服务器连接")
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+    
+    async def _reader_loop(self):
+        """读取连接上的全部消息：已登记任务的进度/完成消息进任务队列，其余进控制队列"""
+        try:
+            async for message_json in self.websocket:
+                message = json.loads(message_json)
+                msg_type = message.get("type", "unknown")
+                logger.debug(f"接收消息: {msg_type}")
+                
+                task_id = (message.get("data") or {}).get("task_id")
+                if msg_type in TASK_MESSAGE_TYPES:
+                    queue = self._task_queues.get(task_id)
+                    if queue is not None:
+                        queue.put_nowait(message)
+                        continue
+                    # 无人等待的任务消息（任务已超时/失败后迟到的帧）不能进控制队列，
+                    # 否则下一个文件的握手会把它当作响应而失败；
+                    # 只有未登记任务的 task_complete 是缓存命中时的握手响应
+                    if msg_type in PROGRESS_MESSAGE_TYPES or task_id in self._retired_tasks:
+                        logger.debug(f"丢弃无法路由的任务消息: {msg_type} (task_id={task_id})")
+                        continue
+                self._control_queue.put_nowait(message)
+        except websockets.exceptions.ConnectionClosed as e:
+            logger.warning(f"服务器连接已关闭: {e}")
+        finally:
+            # 唤醒所有等待者，避免连接断开后空等到超时
+            self._control_queue.put_nowait(None)
+            for queue in self._task_queues.values():
+                queue.put_nowait(None)
+    
+    def _retire_task(self, task_id):
+        """注销任务队列，之后到达的该任务消息由读者任务丢弃"""
+        self._task_queues.pop(task_id, None)
+        self._retired_tasks.add(task_id)
+    
+    @staticmethod
+    async def _get_from_queue(queue, timeout):
+        """从消息队列取一条消息，连接已断开时抛异常"""
+        try:
+            message = await asyncio.wait_for(queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise Exception(f"接收消息超时 ({timeout}秒)")
+        if message is None:
+            raise Exception("服务器连接已断开")
+        return message
     
     def calculate_file_hash(self, file_path):
         """计算文件哈希"""
         hash_md5 = hashlib.md5()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(1 << 20), b""):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
     
     def _process_cached_result(self, response, file_name, file_size, file_hash, start_time):
         """处理缓存结果"""
         transcription_result = response["data"]["result"]
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         # 验证结果
         if not transcription_result:
@@ -101,8 +191,6 @@ class ServerTranscriptionTester:
             "cached_result": True
         }
         
-        self.test_results.append(test_result)
-        
         logger.info(f"转录测试完成(缓存): {len(transcription_result.get('segments', []))} 个片段, "
                    f"{len(transcription_result.get('speakers', []))} 个说话人, "
                    f"总耗时 {processing_time:.2f}秒")
@@ -119,198 +207,162 @@ class ServerTranscriptionTester:
         logger.debug(f"发送消息: {message['type']}")
     
     async def receive_message(self, timeout=30):
-        """接收服务器消息"""
+        """接收服务器控制消息（握手响应），由 _reader_task 投递"""
         if not self.websocket:
             raise Exception("未连接到服务器")
         
-        try:
-            message_json = await asyncio.wait_for(
-                self.websocket.recv(), timeout=timeout
-            )
-            message = json.loads(message_json)
-            logger.debug(f"接收消息: {message.get('type', 'unknown')}")
-            return message
-        except asyncio.TimeoutError:
-            raise Exception(f"接收消息超时 ({timeout}秒)")
+        return await self._get_from_queue(self._control_queue, timeout)
     
     async def upload_file_and_transcribe(self, audio_path, force_refresh=False, output_format="json"):
-        """上传文件并进行转录"""
-        logger.info(f"开始转录测试: {os.path.basename(audio_path)}")
-        start_time = time.time()
-        
-        # 读取音频文件
-        with open(audio_path, 'rb') as f:
-            file_data = f.read()
-        
-        file_name = os.path.basename(audio_path)
-        file_size = len(file_data)
-        file_hash = self.calculate_file_hash(audio_path)
-        file_data_b64 = base64.b64encode(file_data).decode('utf-8')
-        
-        logger.info(f"文件信息: {file_name}, 大小: {file_size/1024:.2f}KB, 哈希: {file_hash[:8]}...")
-        
-        # 1. 发送上传请求
-        upload_request = {
-            "type": "upload_request",
-            "data": {
-                "file_name": file_name,
-                "file_size": file_size,
-                "file_hash": file_hash,
-                "force_refresh": force_refresh,
-                "output_format": output_format
-            }
-        }
-        
-        await self.send_message(upload_request)
-        response = await self.receive_message()
-        
-        if response["type"] == "error":
-            raise Exception(f"上传请求失败: {response['data']['message']}")
-        
-        # 处理不同的响应类型
-        if response["type"] == "upload_ready":
-            task_id = response["data"]["task_id"]
-            logger.info(f"获得任务ID: {task_id}")
-        elif response["type"] == "task_complete":
-            # 直接返回缓存结果的情况
-            logger.info("直接使用缓存结果")
-            return self._process_cached_result(response, file_name, file_size, file_hash, start_time)
-        elif response["type"] == "upload_complete":
-            # 某些情况下可能直接收到 upload_complete（例如服务器快速处理了请求）
-            logger.info("收到 upload_complete，继续等待转录结果")
-            # 获取 task_id（如果响应中包含）
-            task_id = response["data"].get("task_id", "unknown")
-            # 直接跳到等待转录结果的部分
-            # 不需要再上传文件数据
-        else:
-            raise Exception(f"意外的响应类型: {response['type']}")
-        
-        # 2. 上传文件数据（仅在需要时）
-        if response["type"] == "upload_ready":
-            upload_data = {
-                "type": "upload_data",
-                "data": {
-                    "task_id": task_id,
-                    "file_data": file_data_b64
-                }
-            }
-            
-            await self.send_message(upload_data)
-            response = await self.receive_message()
+        """上传文件并进行转录
+
+        握手阶段持有 _upload_lock，上传完成后释放，等待结果阶段与其它任务并发。
+        """
+        async with self._inflight:
+            logger.info(f"开始转录测试: {os.path.basename(audio_path)}")
             
-            if response["type"] == "error":
-                raise Exception(f"文件上传失败: {response['data']['message']}")
-        
-        # 处理响应（仅在上传文件数据后需要）
-        if response["type"] == "upload_ready":
-            while True:
-                # 检查是否是缓存结果（直接完成）
-                if response["type"] == "task_complete":
-                    transcription_result = response["data"]["result"]
-                    logger.info("使用缓存结果，转录完成")
-                    processing_time = time.time() - start_time
-                    
-                    # 验证结果
-                    if not transcription_result:
-                        raise Exception("未收到转录结果")
-                    
-                    # 记录测试结果
-                    test_result = {
+            async with self._upload_lock:
+                # 拿到锁后才开始计时，不把其它文件的握手等待算进本文件的处理时间
+                start_time = time.perf_counter()
+                # 文件内容只在 upload_data 阶段读取，避免大文件在等待转录期间常驻内存
+                # 哈希和读盘编码放到线程里，期间读者任务照常投递其它任务的进度/完成/ping
+                file_name = os.path.basename(audio_path)
+                file_size = os.path.getsize(audio_path)
+                file_hash = await asyncio.to_thread(self.calculate_file_hash, audio_path)
+                
+                logger.info(f"文件信息: {file_name}, 大小: {file_size/1024:.2f}KB, 哈希: {file_hash[:8]}...")
+                
+                # 1. 发送上传请求
+                upload_request = {
+                    "type": "upload_request",
+                    "data": {
                         "file_name": file_name,
                         "file_size": file_size,
                         "file_hash": file_hash,
-                        "task_id": response["data"]["task_id"],
-                        "processing_time": processing_time,
-                        "server_processing_time": transcription_result.get("processing_time", 0),
-                        "transcription_result": transcription_result,
-                        "test_success": True,
-                        "cached_result": True
+                        "force_refresh": force_refresh,
+                        "output_format": output_format
                     }
-                    
-                    self.test_results.append(test_result)
-                    
-                    logger.info(f"转录测试完成(缓存): {len(transcription_result.get('segments', []))} 个片段, "
-                               f"{len(transcription_result.get('speakers', []))} 个说话人, "
-                               f"总耗时 {processing_time:.2f}秒")
-                    
-                    return test_result
-                
-                # 处理 upload_complete 响应
-                elif response["type"] == "upload_complete":
-                    logger.info("文件上传成功，开始转录...")
-                    break
+                }
                 
-                # 处理意外的 upload_ready 重复响应 
-                elif response["type"] == "upload_ready":
-                    logger.warning("收到重复的 upload_ready 响应，继续等待...")
-                    response = await self.receive_message()
-                    continue
+                await self.send_message(upload_request)
+                response = await self.receive_message()
                 
-                # 处理错误响应
-                elif response["type"] == "error":
-                    error_msg = response["data"].get("message", "未知错误")
-                    raise Exception(f"服务器错误: {error_msg}")
+                if response["type"] == "error":
+                    raise Exception(f"上传请求失败: {response['data']['message']}")
                 
-                else:
+                # 处理不同的响应类型
+                if response["type"] == "task_complete":
+                    # 直接返回缓存结果的情况
+                    logger.info("直接使用缓存结果")
+                    return self._process_cached_result(response, file_name, file_size, file_hash, start_time)
+                elif response["type"] == "upload_complete":
+                    # 某些情况下可能直接收到 upload_complete（例如服务器快速处理了请求）
+                    logger.info("收到 upload_complete，继续等待转录结果")
+                    task_id = response["data"].get("task_id", "unknown")
+                elif response["type"] != "upload_ready":
                     raise Exception(f"意外的响应类型: {response['type']}")
+                else:
+                    task_id = response["data"]["task_id"]
+                    logger.info(f"获得任务ID: {task_id}")
+                
+                # 登记任务队列后，该任务的进度/完成消息由读者任务直接投递
+                task_queue = self._task_queues.setdefault(task_id, asyncio.Queue())
+                
+                # 2. 上传文件数据（仅在需要时）
+                if response["type"] == "upload_ready":
+                    await self.send_message(await asyncio.to_thread(self._build_upload_data, task_id, audio_path))
+                    
+                    while True:
+                        response = await self.receive_message()
+                        
+                        if response["type"] == "upload_complete":
+                            logger.info("文件上传成功，开始转录...")
+                            break
+                        elif response["type"] == "task_queued":
+                            queue_position = response["data"].get("queue_position", "N/A")
+                            logger.info(f"文件上传成功，任务排队中，位置: {queue_position}")
+                            break
+                        elif response["type"] == "upload_ready":
+                            # 处理意外的 upload_ready 重复响应
+                            logger.warning("收到重复的 upload_ready 响应，继续等待...")
+                        elif response["type"] == "error":
+                            self._retire_task(task_id)
+                            raise Exception(f"文件上传失败: {response['data']['message']}")
+                        else:
+                            self._retire_task(task_id)
+                            raise Exception(f"意外的响应类型: {response['type']}")
+            
+            # 3. 等待转录结果（已释放上传锁，下一个文件可以开始上传）
+            try:
+                transcription_result = await self._wait_for_result(task_queue)
+            finally:
+                self._retire_task(task_id)
+            
+            processing_time = time.perf_counter() - start_time
+            
+            # 验证结果
+            if not transcription_result:
+                raise Exception("未收到转录结果")
+            
+            # 记录测试结果
+            test_result = {
+                "file_name": file_name,
+                "file_size": file_size,
+                "file_hash": file_hash,
+                "task_id": task_id,
+                "processing_time": processing_time,
+                "server_processing_time": transcription_result.get("processing_time", 0),
+                "transcription_result": transcription_result,
+                "test_success": True
+            }
+            
+            logger.info(f"转录测试完成: {len(transcription_result.get('segments', []))} 个片段, "
+                       f"{len(transcription_result.get('speakers', []))} 个说话人, "
+                       f"总耗时 {processing_time:.2f}秒")
+            
+            return test_result
+    
+    @staticmethod
+    def _build_upload_data(task_id, audio_path):
+        """读取文件并构造 upload_data 消息
+
+        独立成函数让原始字节和 base64 字符串只活在本次调用里，
+        发送完成后即可回收，不会在等待转录结果的几分钟里占用内存。
+        """
+        with open(audio_path, 'rb') as f:
+            file_data_b64 = base64.b64encode(f.read()).decode('utf-8')
         
-        # 3. 等待转录结果
-        transcription_result = None
-        
+        return {
+            "type": "upload_data",
+            "data": {
+                "task_id": task_id,
+                "file_data": file_data_b64
+            }
+        }
+    
+    async def _wait_for_result(self, task_queue, timeout=300):
+        """从任务队列等待转录结果（单条消息 5 分钟超时）"""
         while True:
             try:
-                response = await self.receive_message(timeout=300)  # 5分钟超时
-                
-                if response["type"] == "task_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
+                response = await self._get_from_queue(task_queue, timeout)
                 
-                elif response["type"] == "transcription_progress":
-                    progress = response["data"]["progress"]
-                    logger.info(f"转录进度: {progress}%")
+                if response["type"] in ("task_progress", "transcription_progress"):
+                    data = response["data"]
+                    if data.get("status") == "failed":
+                        raise Exception(f"转录失败: {data.get('message')}")
+                    logger.info(f"转录进度[{data.get('task_id', '')[:8]}]: {data['progress']}%")
                 
                 elif response["type"] == "task_complete":
-                    transcription_result = response["data"]["result"]
                     logger.info("转录完成")
-                    break
+                    return response["data"]["result"]
                 
                 elif response["type"] == "transcription_complete":
-                    transcription_result = response["data"]
                     logger.info("转录完成")
-                    break
-                
-                elif response["type"] == "error":
-                    raise Exception(f"转录失败: {response['data']['message']}")
+                    return response["data"]
                 
             except Exception as e:
                 logger.error(f"等待转录结果时出错: {e}")
                 raise
-        
-        processing_time = time.time() - start_time
-        
-        # 验证结果
-        if not transcription_result:
-            raise Exception("未收到转录结果")
-        
-        # 记录测试结果
-        test_result = {
-            "file_name": file_name,
-            "file_size": file_size,
-            "file_hash": file_hash,
-            "task_id": task_id,
-            "processing_time": processing_time,
-            "server_processing_time": transcription_result.get("processing_time", 0),
-            "transcription_result": transcription_result,
-            "test_success": True
-        }
-        
-        self.test_results.append(test_result)
-        
-        logger.info(f"转录测试完成: {len(transcription_result.get('segments', []))} 个片段, "
-                   f"{len(transcription_result.get('speakers', []))} 个说话人, "
-                   f"总耗时 {processing_time:.2f}秒")
-        
-        return test_result
     
     def validate_transcription_result(self, result):
         """验证转录结果"""
@@ -343,12 +395,9 @@ class ServerTranscriptionTester:
         
         # 检查合并效果
         if len(segments) > 0:
-            speaker_segments = {}
-            for segment in segments:
-                speaker = segment.get("speaker", "Unknown")
-                speaker_segments[speaker] = speaker_segments.get(speaker, 0) + 1
+            speaker_segments = Counter(segment.get("speaker", "Unknown") for segment in segments)
             
-            logger.info(f"说话人片段分布: {speaker_segments}")
+            logger.info(f"说话人片段分布: {dict(speaker_segments)}")
         
         return validation_errors
     
@@ -379,6 +428,7 @@ class ServerTranscriptionTester:
                     f.write(srt_content)
                 
                 logger.info(f"SRT文件已保存: {srt_filename}")
+                self._record_result(result)
                 return True
             else:
                 logger.error("未收到SRT格式结果")
@@ -399,10 +449,7 @@ class ServerTranscriptionTester:
         try:
             # 查找测试音频文件
             samples_dir = project_root / "samples"
-            audio_files = []
-            
-            for ext in ['.wav', '.mp3', '.mp4', '.m4a', '.flac', '.webm']:
-                audio_files.extend(samples_dir.glob(f"*{ext}"))
+            audio_files = list_audio(samples_dir, AUDIO_EXTENSIONS | {'.webm'})
             
             if not audio_files:
                 logger.error("未找到测试音频文件")
@@ -410,39 +457,20 @@ class ServerTranscriptionTester:
             
             logger.info(f"找到 {len(audio_files)} 个测试文件")
             
-            # 测试每个文件
-            for i, audio_file in enumerate(audio_files, 1):
-                logger.info(f"\n=== 测试文件 {i}/{len(audio_files)}: {audio_file.name} ===")
-                
-                try:
-                    # 测试JSON格式转录
-                    result = await self.upload_file_and_transcribe(str(audio_file))
-                    
-                    # 验证结果
-                    validation_errors = self.validate_transcription_result(result)
-                    
-                    if validation_errors:
-                        logger.warning(f"验证发现问题: {validation_errors}")
-                        result["validation_errors"] = validation_errors
-                    else:
-                        logger.info("✓ 转录结果验证通过")
-                    
-                    # 保存单个测试结果
-                    self.save_test_result(result, f"server_test_{audio_file.stem}")
-                    
-                    # 测试SRT格式（仅对第一个文件）
-                    if i == 4:
-                        logger.info("\n=== 测试SRT格式输出 ===")
-                        await self.test_srt_format(audio_file)
-                    
-                except Exception as e:
-                    logger.error(f"✗ 测试失败: {e}")
-                    error_result = {
-                        "file_name": audio_file.name,
-                        "test_success": False,
-                        "error": str(e)
-                    }
-                    self.test_results.append(error_result)
+            # 每个测试结果完成即写入 NDJSON，内存里只保留精简记录
+            output_dir = project_root / "tests" / "output"
+            output_dir.mkdir(exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._results_path = output_dir / f"{timestamp}_server_test_results.ndjson"
+            self._results_fp = open(self._results_path, "wb", buffering=1 << 20)
+            logger.info(f"测试结果逐条写入: {self._results_path.name}")
+            
+            # 并发提交所有文件，由 send-ahead 流水线控制同时在途的任务数
+            logger.info(f"流水线在途任务上限: {self.max_inflight}")
+            await asyncio.gather(*(
+                self._test_single_file(i, len(audio_files), audio_file)
+                for i, audio_file in enumerate(audio_files, 1)
+            ))
             
             # 保存完整测试报告
             self.save_test_summary()
@@ -450,8 +478,58 @@ class ServerTranscriptionTester:
             return True
             
         finally:
+            if self._results_fp:
+                self._results_fp.close()
+                self._results_fp = None
             await self.disconnect_from_server()
     
+    async def _test_single_file(self, i, total, audio_file):
+        """测试单个文件：JSON 转录 + 结果验证 + 保存，第 4 个文件额外测试 SRT 输出"""
+        logger.info(f"\n=== 测试文件 {i}/{total}: {audio_file.name} ===")
+        
+        try:
+            # 测试JSON格式转录
+            result = await self.upload_file_and_transcribe(str(audio_file))
+            
+            # 验证结果
+            validation_errors = self.validate_transcription_result(result)
+            
+            if validation_errors:
+                logger.warning(f"验证发现问题: {validation_errors}")
+                result["validation_errors"] = validation_errors
+            else:
+                logger.info("✓ 转录结果验证通过")
+            
+            # 保存单个测试结果
+            self._record_result(result)
+            self.save_test_result(result, f"server_test_{audio_file.stem}")
+            
+            # 测试SRT格式（仅对第一个文件）
+            if i == 4:
+                logger.info("\n=== 测试SRT格式输出 ===")
+                await self.test_srt_format(audio_file)
+            
+        except Exception as e:
+            logger.error(f"✗ 测试失败: {e}")
+            error_result = {
+                "file_name": audio_file.name,
+                "test_success": False,
+                "error": str(e)
+            }
+            self._record_result(error_result)
+    
+    def _record_result(self, result):
+        """记录一条测试结果：完整内容追加到 NDJSON 文件，内存只留不含转录内容的精简记录"""
+        if self._results_fp:
+            self._results_fp.write(dumps_json_line(result))
+            self._results_fp.flush()
+        
+        brief = {k: v for k, v in result.items() if k != "transcription_result"}
+        transcription = result.get("transcription_result") or {}
+        brief["duration"] = transcription.get("duration", 0.0)
+        brief["speakers_count"] = len(transcription.get("speakers", []))
+        self.test_results.append(brief)
+    
     def save_test_result(self, result, filename):
         """保存单个测试结果"""
         output_dir = project_root / "tests" / "output"
@@ -462,19 +540,31 @@ class ServerTranscriptionTester:
         output_filename = f"{timestamp}_{filename}.json"
         output_path = output_dir / output_filename
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_json(result, output_path)
         
         logger.info(f"测试结果已保存: {output_filename}")
     
     def save_test_summary(self):
         """保存测试总结"""
+        total = len(self.test_results)
+        # 成功标记/耗时各取一次成数组，统计量用 numpy 归约
+        statuses = np.fromiter(
+            (r.get("test_success", False) for r in self.test_results), dtype=bool, count=total
+        )
+        times = np.fromiter(
+            (r.get("processing_time", 0.0) for r in self.test_results), dtype=np.float64, count=total
+        )
+        success_count = int(statuses.sum())
+        
         summary = {
             "test_time": time.strftime("%Y-%m-%d %H:%M:%S"),
             "server_url": self.server_url,
-            "total_tests": len(self.test_results),
-            "successful_tests": len([r for r in self.test_results if r.get("test_success", False)]),
-            "failed_tests": len([r for r in self.test_results if not r.get("test_success", False)]),
+            "total_tests": total,
+            "successful_tests": success_count,
+            "failed_tests": total - success_count,
+            "total_processing_time": float(times.sum()),
+            "mean_processing_time": float(times[statuses].mean()) if success_count else 0.0,
+            "results_file": self._results_path.name if self._results_path else None,
             "results": self.test_results
         }
         
@@ -485,10 +575,23 @@ class ServerTranscriptionTester:
         output_filename = f"{timestamp}_server_test_summary.json"
         output_path = output_dir / output_filename
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        dump_json(summary, output_path)
+        
+        # 人读的定宽文本总结：每个文件一行，不经过 JSON 序列化
+        summary_lines = [
+            SUMMARY_LINE.format(
+                file=r.get("file_name", "?"),
+                dur=r.get("duration", 0.0),
+                ptime=r.get("processing_time", 0.0),
+                spk=r.get("speakers_count", 0),
+                status="OK" if r.get("test_success") else "FAIL",
+            )
+            for r in self.test_results
+        ]
+        text_path = output_dir / f"{timestamp}_server_test_summary.txt"
+        text_path.write_text("\n".join(summary_lines) + "\n", encoding="utf-8")
         
-        logger.info(f"测试总结已保存: {output_filename}")
+        logger.info(f"测试总结已保存: {output_filename}, {text_path.name}")
         logger.info(f"测试完成: {summary['successful_tests']}/{summary['total_tests']} 成功")
 
 
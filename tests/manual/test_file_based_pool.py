@@ -1,20 +1,128 @@
 """
 测试文件系统进程池的并发转录
+
+环境变量 FUNASR_TEST_INPROC=1 时，test_concurrent_tasks 跳过进程池初始化，
+改用线程池驱动同一进程内的共享模型（基准对比模式，不占用多份模型内存）。
+FunASR VAD 不支持并发调用，共享模型上的 generate 用线程锁串行执行，
+对应 FunASRTranscriber 的 lock 模式，得到的是串行基准而非并发数据。
 """
 import asyncio
-import json
+import functools
 import time
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加项目根目录到 Python 路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.core.file_based_process_pool import FileBasedProcessPool
+from tests.manual._audio_files import first_audio, list_audio
 from loguru import logger
 
 
+# 进程内基准模式开关
+INPROC_MODE = os.environ.get("FUNASR_TEST_INPROC") == "1"
+
+# 进程内模式的线程池，首次使用时创建，跨任务复用；pool_size 变化时重建
+_inproc_executor = None
+_inproc_pool_size = None
+
+# 共享模型的调用锁：Python 版 FunASR VAD 不支持并发（同 FunASRTranscriber._model_lock）
+_inproc_model_lock = threading.Lock()
+
+
+def _get_inproc_model():
+    """按全局配置获取进程内共享的 FunASR 模型（与 worker_process.initialize_model 参数一致）"""
+    from src.core.config import config as global_config
+    from src.core.device_manager import DeviceManager
+    from tests.manual._model_cache import get_model
+
+    funasr_config = global_config.funasr
+    return get_model(
+        model=funasr_config.model,
+        model_revision=funasr_config.model_revision,
+        vad_model=funasr_config.vad_model,
+        vad_model_revision=funasr_config.vad_model_revision,
+        punc_model=funasr_config.punc_model,
+        punc_model_revision=funasr_config.punc_model_revision,
+        spk_model=funasr_config.spk_model,
+        spk_model_revision=funasr_config.spk_model_revision,
+        cache_dir=funasr_config.model_dir,
+        ncpu=funasr_config.ncpu,
+        device=DeviceManager.select_device(global_config.model_dump()),
+        disable_update=funasr_config.disable_update,
+        disable_pbar=funasr_config.disable_pbar,
+    )
+
+
+def _generate_locked(model, **kwargs):
+    """持锁调用共享模型的 generate"""
+    with _inproc_model_lock:
+        return model.generate(**kwargs)
+
+
+def _submit_inproc(audio_files, pool_size):
+    """用线程池 + 共享模型提交多个文件（generate 持锁串行），返回每个文件对应的 Future（与 audio_files 顺序一致）"""
+    global _inproc_executor, _inproc_pool_size
+    from src.core.config import config as global_config
+
+    if _inproc_executor is None or _inproc_pool_size != pool_size:
+        if _inproc_executor is not None:
+            _inproc_executor.shutdown(wait=False)
+        _inproc_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="inproc-asr")
+        _inproc_pool_size = pool_size
+
+    model = _get_inproc_model()
+    loop = asyncio.get_running_loop()
+    return [
+        loop.run_in_executor(
+            _inproc_executor,
+            functools.partial(
+                _generate_locked,
+                model,
+                input=str(audio_file),
+                batch_size_s=global_config.funasr.batch_size_s,
+                hotword='',
+            ),
+        )
+        for audio_file in audio_files
+    ]
+
+
+async def _timed(index, awaitable):
+    """等待单个任务并记录其自身耗时，异常作为结果返回（同 return_exceptions=True）"""
+    start_time = time.perf_counter()
+    try:
+        result = await awaitable
+    except Exception as e:
+        result = e
+    return index, result, time.perf_counter() - start_time
+
+
+def _list_largest_first(dirpath, extensions, limit):
+    """按文件名取前 limit 个音频，再按大小降序排列；同步函数，整体放进 to_thread 执行"""
+    files = list_audio(dirpath, extensions)[:limit]
+    files.sort(key=lambda p: p.stat().st_size, reverse=True)
+    return files
+
+
+def _use_pool_config(max_concurrent_tasks=2):
+    """
+    在当前进程内把全局配置切到文件系统进程池模式
+
+    concurrency_mode / max_concurrent_tasks 只由本进程的 FunASRTranscriber 和
+    FileBasedProcessPool 读取（worker 子进程只用 funasr 段），直接改内存中的
+    全局配置即可，不再读改写 config.json，也不会影响同时运行的其它进程。
+    """
+    from src.core.config import config as global_config
+
+    global_config.transcription.concurrency_mode = "pool"
+    global_config.transcription.max_concurrent_tasks = max_concurrent_tasks
+
+
 async def test_single_task():
     """测试单个任务处理"""
     logger.info("=" * 50)
@@ -24,19 +132,8 @@ async def test_single_task():
     # 配置文件路径
     config_path = "config.json"
     
-    # 确保配置正确
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    
-    # 设置为进程池模式
-    config["transcription"]["concurrency_mode"] = "pool"
-    config["transcription"]["max_concurrent_tasks"] = 2
-    
-    # 保存配置
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
-    
-    logger.info("配置已更新为文件系统进程池模式")
+    # 进程内切换为进程池模式
+    _use_pool_config()
     
     # 创建进程池
     pool = FileBasedProcessPool(config_path, pool_size=2)
@@ -53,11 +150,9 @@ async def test_single_task():
             "tests/test_data/test.m4a"
         ]
         
-        audio_file = None
-        for test_file in test_files:
-            if Path(test_file).exists():
-                audio_file = test_file
-                break
+        audio_file = await asyncio.to_thread(
+            lambda: next((f for f in test_files if Path(f).exists()), None)
+        )
         
         if not audio_file:
             # 创建一个简单的测试文件
@@ -66,14 +161,10 @@ async def test_single_task():
             
             # 查找上传目录中的文件
             upload_dir = Path("uploads")
-            if upload_dir.exists():
-                audio_files = (list(upload_dir.glob("*.m4a")) + 
-                              list(upload_dir.glob("*.mp3")) + 
-                              list(upload_dir.glob("*.wav")) +
-                              list(upload_dir.glob("*.mp4")))
-                if audio_files:
-                    audio_file = str(audio_files[0])
-                    logger.info(f"使用上传目录中的文件: {audio_file}")
+            upload_file = await asyncio.to_thread(first_audio, upload_dir, {'.m4a', '.mp3', '.wav', '.mp4'})
+            if upload_file:
+                audio_file = str(upload_file)
+                logger.info(f"使用上传目录中的文件: {audio_file}")
         
         if not audio_file:
             logger.warning("未找到测试音频文件")
@@ -83,12 +174,12 @@ async def test_single_task():
         logger.info(f"测试文件: {audio_file}")
         
         # 处理单个任务
-        start_time = time.time()
+        start_time = time.perf_counter()
         logger.info("提交任务到进程池...")
         
         result = await pool.generate_with_pool(audio_file)
         
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         
         if result:
             logger.success(f"任务成功完成，耗时: {elapsed_time:.2f}秒")
@@ -114,36 +205,30 @@ async def test_concurrent_tasks():
     # 配置文件路径
     config_path = "config.json"
     
-    # 确保配置正确
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    
-    # 设置为进程池模式
-    config["transcription"]["concurrency_mode"] = "pool"
-    config["transcription"]["max_concurrent_tasks"] = 2
-    
-    # 保存配置
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+    # 进程内切换为进程池模式
+    _use_pool_config()
     
-    # 创建进程池
-    pool = FileBasedProcessPool(config_path, pool_size=2)
+    # 创建进程池（进程内基准模式下跳过）
+    pool = None if INPROC_MODE else FileBasedProcessPool(config_path, pool_size=2)
     
     try:
-        # 初始化进程池
-        logger.info("初始化进程池...")
-        await pool.initialize()
+        if pool:
+            # 初始化进程池
+            logger.info("初始化进程池...")
+            await pool.initialize()
+        else:
+            # 与 pool.initialize() 对齐：模型加载和首次推理开销都放在计时之前
+            from tests.manual._model_cache import warm_model
+            
+            logger.info("FUNASR_TEST_INPROC=1: 使用线程池 + 进程内共享模型（generate 持锁串行，结果为串行基准）")
+            warm_model(_get_inproc_model())
         
         # 查找测试音频文件
         upload_dir = Path("uploads")
-        audio_files = []
-        
-        if upload_dir.exists():
-            audio_files = (list(upload_dir.glob("*.m4a")) + 
-                          list(upload_dir.glob("*.mp3")) + 
-                          list(upload_dir.glob("*.wav")) +
-                          list(upload_dir.glob("*.mp4")))
-            audio_files = audio_files[:4]  # 最多测试4个文件
+        # 最多测试4个文件；大文件先提交（LPT 调度）：每个 worker 独立处理整文件，先排长任务能缩短整体尾部等待
+        audio_files = await asyncio.to_thread(
+            _list_largest_first, upload_dir, {'.m4a', '.mp3', '.wav', '.mp4'}, 4
+        )
         
         if not audio_files:
             logger.warning("未找到测试音频文件")
@@ -153,27 +238,28 @@ async def test_concurrent_tasks():
         
         # 并发处理任务
         tasks = []
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        for i, audio_file in enumerate(audio_files):
-            logger.info(f"提交任务 {i+1}: {audio_file.name}")
-            task = pool.generate_with_pool(str(audio_file))
-            tasks.append(task)
+        if pool:
+            for i, audio_file in enumerate(audio_files):
+                logger.info(f"提交任务 {i+1}: {audio_file.name}")
+                task = pool.generate_with_pool(str(audio_file))
+                tasks.append(task)
+        else:
+            tasks = _submit_inproc(audio_files, pool_size=2)
         
-        # 等待所有任务完成
+        # 按完成顺序逐个统计，先完成的任务立即输出结果和各自耗时
         logger.info("等待所有任务完成...")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 统计结果
         success_count = 0
-        for i, result in enumerate(results):
+        for next_done in asyncio.as_completed([_timed(i, task) for i, task in enumerate(tasks)]):
+            i, result, task_time = await next_done
             if isinstance(result, Exception):
-                logger.error(f"任务 {i+1} 失败: {result}")
+                logger.error(f"任务 {i+1} 失败: {result}（耗时 {task_time:.2f}秒）")
             else:
-                logger.success(f"任务 {i+1} 成功完成")
+                logger.success(f"任务 {i+1} 成功完成: {audio_files[i].name}，耗时 {task_time:.2f}秒")
                 success_count += 1
         
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         
         logger.info("=" * 50)
         logger.info("测试结果统计:")
@@ -187,8 +273,9 @@ async def test_concurrent_tasks():
         
     finally:
         # 清理资源
-        logger.info("清理进程池...")
-        pool.cleanup()
+        if pool:
+            logger.info("清理进程池...")
+            pool.cleanup()
 
 
 async def test_with_transcriber():
@@ -202,17 +289,8 @@ async def test_with_transcriber():
     # 配置文件路径
     config_path = "config.json"
     
-    # 确保配置正确
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    
-    # 设置为进程池模式
-    config["transcription"]["concurrency_mode"] = "pool"
-    config["transcription"]["max_concurrent_tasks"] = 2
-    
-    # 保存配置
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+    # 进程内切换为进程池模式
+    _use_pool_config()
     
     logger.info("创建 FunASRTranscriber 实例...")
     
@@ -222,13 +300,8 @@ async def test_with_transcriber():
     
     # 查找测试音频文件
     upload_dir = Path("uploads")
-    audio_files = []
-    
-    if upload_dir.exists():
-        audio_files = (list(upload_dir.glob("*.m4a")) + 
-                      list(upload_dir.glob("*.mp3")) +
-                      list(upload_dir.glob("*.mp4")))
-        audio_files = audio_files[:2]  # 测试2个文件
+    # 测试2个文件；大文件先提交（LPT 调度），同 test_concurrent_tasks
+    audio_files = await asyncio.to_thread(_list_largest_first, upload_dir, {'.m4a', '.mp3', '.mp4'}, 2)
     
     if not audio_files:
         logger.warning("未找到测试音频文件")
@@ -247,19 +320,17 @@ async def test_with_transcriber():
         )
         tasks.append(task)
     
-    # 等待所有任务完成
-    start_time = time.time()
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    elapsed_time = time.time() - start_time
-    
-    # 分析结果
+    # 按完成顺序逐个分析结果，同 test_concurrent_tasks
+    start_time = time.perf_counter()
     success_count = 0
-    for i, result in enumerate(results):
+    for next_done in asyncio.as_completed([_timed(i, task) for i, task in enumerate(tasks)]):
+        i, result, task_time = await next_done
         if isinstance(result, Exception):
-            logger.error(f"任务 {i} 失败: {result}")
+            logger.error(f"任务 {i} 失败: {result}（耗时 {task_time:.2f}秒）")
         else:
-            logger.success(f"任务 {i} 成功")
+            logger.success(f"任务 {i} 成功，耗时 {task_time:.2f}秒")
             success_count += 1
+    elapsed_time = time.perf_counter() - start_time
     
     logger.info(f"\n测试结果:")
     logger.info(f"  成功: {success_count}/{len(tasks)}")
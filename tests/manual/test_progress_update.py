@@ -5,6 +5,8 @@
 """
 
 import asyncio
+import base64
+import hashlib
 import json
 import websockets
 import time
@@ -17,6 +19,32 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
+# 每批最多处理的消息数，避免进度风暴时一次处理过多而饿死其它协程
+MAX_BATCH = 32
+
+
+async def _pump_messages(websocket, queue):
+    """持续读取连接上的消息放入队列，连接关闭时放入 None 作为结束标记"""
+    try:
+        async for message in websocket:
+            queue.put_nowait(message)
+    except websockets.exceptions.ConnectionClosed:
+        pass
+    finally:
+        queue.put_nowait(None)
+
+
+async def _next_batch(queue, timeout):
+    """等待至少一条消息，再顺带取走已到达的消息（最多 MAX_BATCH 条）"""
+    batch = [await asyncio.wait_for(queue.get(), timeout=timeout)]
+    while len(batch) < MAX_BATCH:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
 async def test_progress_update():
     """测试进度更新功能"""
     server_url = "ws://localhost:8767"
@@ -37,66 +65,113 @@ async def test_progress_update():
             with open(audio_file, 'rb') as f:
                 audio_data = f.read()
             
-            # 准备请求
+            # 1. 上传请求：只带文件元信息，强制刷新以观察完整的进度过程
             request = {
-                "type": "transcribe",
-                "audio_data": audio_data.hex(),  # 转换为十六进制字符串
-                "format": "wav",
-                "options": {
-                    "language": "zh",
-                    "enable_timestamps": True,
-                    "enable_speaker": False
+                "type": "upload_request",
+                "data": {
+                    "file_name": Path(audio_file).name,
+                    "file_size": len(audio_data),
+                    "file_hash": hashlib.md5(audio_data).hexdigest(),
+                    "force_refresh": True,
+                    "output_format": "json"
                 }
             }
             
-            # 发送请求
-            logger.info("发送转录请求...")
+            logger.info("发送上传请求...")
             await websocket.send(json.dumps(request))
             
+            # 等待 upload_ready（跳过 connected 等欢迎消息）
+            while True:
+                data = json.loads(await asyncio.wait_for(websocket.recv(), timeout=30))
+                if data.get("type") == "upload_ready":
+                    task_id = data["data"]["task_id"]
+                    break
+                if data.get("type") == "error":
+                    logger.error(f"上传请求失败: {data['data'].get('message')}")
+                    return
+            
+            # 2. 上传文件数据：base64 由 C 实现编码，体积为原始的 4/3（十六进制为 2 倍）
+            logger.info("发送转录请求...")
+            await websocket.send(json.dumps({
+                "type": "upload_data",
+                "data": {
+                    "task_id": task_id,
+                    "file_data": base64.b64encode(audio_data).decode('ascii')
+                }
+            }))
+            del audio_data
+            
             # 接收响应和进度更新
             start_time = time.time()
             progress_updates = []
             
-            while True:
-                try:
-                    response = await asyncio.wait_for(websocket.recv(), timeout=300)
-                    data = json.loads(response)
-                    
-                    if data.get("type") == "progress":
-                        progress = data.get("progress", 0)
-                        elapsed = time.time() - start_time
-                        progress_updates.append({
-                            "progress": progress,
-                            "elapsed_time": elapsed
-                        })
-                        logger.info(f"进度更新: {progress}% (已用时: {elapsed:.1f}秒)")
+            # 单个读者任务持续收帧入队，主循环每次唤醒后把已到达的消息一批处理完
+            pending = asyncio.Queue()
+            reader = asyncio.create_task(_pump_messages(websocket, pending))
+            
+            try:
+                done = False
+                while not done:
+                    try:
+                        batch = await _next_batch(pending, timeout=300)
+                    except asyncio.TimeoutError:
+                        logger.error("接收响应超时")
+                        break
                     
-                    elif data.get("type") == "result":
-                        total_time = time.time() - start_time
-                        logger.success(f"转录完成，总用时: {total_time:.1f}秒")
+                    for response in batch:
+                        if response is None:
+                            logger.error("服务器连接已断开")
+                            done = True
+                            break
                         
-                        # 显示进度更新统计
-                        if progress_updates:
-                            logger.info("\n进度更新统计:")
-                            logger.info(f"更新次数: {len(progress_updates)}")
-                            for update in progress_updates:
-                                logger.info(f"  {update['elapsed_time']:.1f}秒: {update['progress']}%")
+                        data = json.loads(response)
                         
-                        # 显示转录结果摘要
-                        if "result" in data:
-                            text = data["result"].get("text", "")
-                            logger.info(f"转录文本长度: {len(text)} 字符")
-                            if len(text) > 100:
-                                logger.info(f"转录文本摘要: {text[:100]}...")
-                        break
-                    
-                    elif data.get("type") == "error":
-                        logger.error(f"转录错误: {data.get('message')}")
-                        break
+                        if data.get("type") == "task_progress":
+                            progress = data["data"].get("progress", 0)
+                            if data["data"].get("status") == "failed":
+                                logger.error(f"转录错误: {data['data'].get('message')}")
+                                done = True
+                                break
+                            elapsed = time.time() - start_time
+                            progress_updates.append({
+                                "progress": progress,
+                                "elapsed_time": elapsed
+                            })
+                            # 进度帧可能很多，日志级别高于 INFO 时跳过格式化
+                            logger.opt(lazy=True).info(
+                                "进度更新: {}% (已用时: {:.1f}秒)", lambda: progress, lambda: elapsed
+                            )
                         
-                except asyncio.TimeoutError:
-                    logger.error("接收响应超时")
-                    break
+                        elif data.get("type") == "task_complete":
+                            total_time = time.time() - start_time
+                            logger.success(f"转录完成，总用时: {total_time:.1f}秒")
+                            
+                            # 显示进度更新统计
+                            if progress_updates:
+                                logger.info("\n进度更新统计:")
+                                logger.info(f"更新次数: {len(progress_updates)}")
+                                # 逐条明细拼成一条日志输出
+                                logger.info("\n".join(
+                                    f"  {update['elapsed_time']:.1f}秒: {update['progress']}%"
+                                    for update in progress_updates
+                                ))
+                            
+                            # 显示转录结果摘要
+                            result = data["data"].get("result")
+                            if result:
+                                text = "".join(seg.get("text", "") for seg in result.get("segments", []))
+                                logger.info(f"转录文本长度: {len(text)} 字符")
+                                if len(text) > 100:
+                                    logger.info(f"转录文本摘要: {text[:100]}...")
+                            done = True
+                            break
+                        
+                        elif data.get("type") == "error":
+                            logger.error(f"转录错误: {data['data'].get('message')}")
+                            done = True
+                            break
+            finally:
+                reader.cancel()
                     
     except Exception as e:
         logger.error(f"测试失败: {e}")
@@ -239,8 +239,8 @@ class TestCallSitesUseCacheParams:
 
         with patch.object(handler, "_calculate_file_hash", return_value="match"), \
              patch("src.core.database.db_manager") as mock_db, \
-             patch("src.utils.file_utils.save_uploaded_file",
-                   new=AsyncMock(return_value=(str(tmp_path / "saved.wav"), None))), \
+             patch("src.utils.file_utils.move_uploaded_file",
+                   new=AsyncMock(return_value=str(tmp_path / "saved.wav"))), \
              patch("src.core.task_manager.task_manager") as mock_tm:
             mock_db.get_cached_result = AsyncMock(return_value=None)
             mock_tm.create_task = AsyncMock(return_value=TranscriptionTask(
@@ -161,8 +161,8 @@ async def test_chunked_finalize_builds_request_with_diarize(fake_ws, tmp_path):
         )
 
     with patch.object(handler, "_calculate_file_hash", return_value="match"), \
-         patch("src.utils.file_utils.save_uploaded_file",
-               new=AsyncMock(return_value=(str(tmp_path / "saved.wav"), None))), \
+         patch("src.utils.file_utils.move_uploaded_file",
+               new=AsyncMock(return_value=str(tmp_path / "saved.wav"))), \
          patch("src.core.task_manager.task_manager") as mock_tm:
         mock_tm.create_task = AsyncMock(side_effect=fake_create_task)
         mock_tm.submit_task = AsyncMock(return_value=None)
@@ -220,8 +220,8 @@ async def test_chunked_finalize_builds_request_with_word_align(fake_ws, tmp_path
         )
 
     with patch.object(handler, "_calculate_file_hash", return_value="match"), \
-         patch("src.utils.file_utils.save_uploaded_file",
-               new=AsyncMock(return_value=(str(tmp_path / "saved.wav"), None))), \
+         patch("src.utils.file_utils.move_uploaded_file",
+               new=AsyncMock(return_value=str(tmp_path / "saved.wav"))), \
          patch("src.core.task_manager.task_manager") as mock_tm:
         mock_tm.create_task = AsyncMock(side_effect=fake_create_task)
         mock_tm.submit_task = AsyncMock(return_value=None)
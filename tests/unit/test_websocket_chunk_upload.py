@@ -12,18 +12,20 @@ TODOS #24 分片上传安全网 — Lane C1: `_handle_chunk_upload` 逐帧接收
 5. 分片 hash 校验失败              → chunk_hash_mismatch, 不计入 chunks_received
 6. 正常分片                        → chunk_received(status=received) + 写盘 + 计数
 7. 最后一片收齐                    → 触发 _finalize_chunked_upload
+8. 二进制分片帧                    → 解析/格式错误/落盘
 
 这些是 characterization 测试(钉现有行为),mock `_send_message` / `_send_error`
 与 `_finalize_chunked_upload` 隔离,不连真 server。
 """
 import base64
 import hashlib
+import json
 import time
 from unittest.mock import patch, AsyncMock, MagicMock
 
 import pytest
 
-from src.api.websocket_handler import WebSocketHandler
+from src.api.websocket_handler import WebSocketHandler, parse_binary_chunk_frame
 
 
 @pytest.fixture
@@ -176,6 +178,19 @@ class TestChunkUploadHappyPath:
             assert rec.args[2]["status"] == "received"
             assert not err_types(se)
 
+    @pytest.mark.asyncio
+    async def test_no_hash_provided_skips_md5(self, handler, fake_ws, tmp_path):
+        """未带 chunk_hash 时不计算分片 MD5（整文件校验在 finalize 兜底）"""
+        task_id, temp = make_uploading_session(handler, tmp_path, total_chunks=2)
+        with patch.object(handler, "_send_message", new=AsyncMock()), \
+             patch.object(handler, "_send_error", new=AsyncMock()), \
+             patch.object(handler, "_finalize_chunked_upload", new=AsyncMock()), \
+             patch("src.api.websocket_handler.hashlib.md5") as md5:
+            await handler._handle_chunk_upload(
+                fake_ws, "c1", chunk_frame(task_id, 0, b"BBBB", with_hash=False))
+            md5.assert_not_called()
+            assert temp.read_bytes()[:4] == b"BBBB"
+
     @pytest.mark.asyncio
     async def test_final_chunk_triggers_finalize(self, handler, fake_ws, tmp_path):
         task_id, temp = make_uploading_session(handler, tmp_path, total_chunks=1, chunk_size=4)
@@ -186,3 +201,70 @@ class TestChunkUploadHappyPath:
                 fake_ws, "c1", chunk_frame(task_id, 0, b"CCCC"))
             # 收齐 → 触发 finalize
             fz.assert_awaited_once()
+
+
+def binary_frame(task_id, chunk_index, payload: bytes) -> bytes:
+    """构造二进制分片帧: [4 字节 header 长度][JSON header][原始字节]"""
+    header = json.dumps({
+        "task_id": task_id,
+        "chunk_index": chunk_index,
+        "chunk_hash": hashlib.md5(payload).hexdigest(),
+    }).encode("utf-8")
+    return len(header).to_bytes(4, "big") + header + payload
+
+
+class TestBinaryChunkFrame:
+    def test_parse_roundtrip(self):
+        data = parse_binary_chunk_frame(binary_frame("t1", 3, b"\x00\x01raw"))
+        assert data["task_id"] == "t1"
+        assert data["chunk_index"] == 3
+        assert bytes(data["chunk_bytes"]) == b"\x00\x01raw"
+
+    @pytest.mark.parametrize("message", [
+        b"\x00\x00",                                  # 不足 4 字节
+        (100).to_bytes(4, "big") + b"{}",             # header 长度越界
+        (2).to_bytes(4, "big") + b"[]payload",        # header 不是对象
+        (2).to_bytes(4, "big") + b"{xpayload",        # header 不是 JSON
+    ])
+    def test_malformed_frame_rejected(self, message):
+        with pytest.raises(ValueError):
+            parse_binary_chunk_frame(message)
+
+    @pytest.mark.asyncio
+    async def test_binary_chunk_written(self, handler, fake_ws, tmp_path):
+        task_id, temp = make_uploading_session(handler, tmp_path, total_chunks=2, chunk_size=4)
+        data = parse_binary_chunk_frame(binary_frame(task_id, 1, b"DDDD"))
+        with patch.object(handler, "_send_message", new=AsyncMock()) as sm, \
+             patch.object(handler, "_send_error", new=AsyncMock()) as se, \
+             patch.object(handler, "_finalize_chunked_upload", new=AsyncMock()):
+            await handler._handle_chunk_upload(fake_ws, "c1", data)
+            rec = next(c for c in msg_calls(sm) if c.args[1] == "chunk_received")
+            assert rec.args[2]["status"] == "received"
+            assert temp.read_bytes()[4:8] == b"DDDD"
+            assert not err_types(se)
+
+    @pytest.mark.asyncio
+    async def test_json_sent_as_binary_frame_still_dispatched(self, handler, monkeypatch):
+        """以二进制帧发送的 JSON 消息（如 ws.send(orjson.dumps(msg))）仍走 JSON 分支，不当分片帧解析"""
+        from src.core.config import config
+        monkeypatch.setattr(config.auth, "enabled", False)
+        frame = binary_frame("t1", 0, b"RAW")
+
+        class FrameSocket:
+            remote_address = ("127.0.0.1", 1234)
+            send = AsyncMock()
+
+            async def __aiter__(self):
+                yield json.dumps({"type": "ping", "data": {}}).encode("utf-8")
+                yield frame
+
+        with patch.object(handler, "_send_message", new=AsyncMock()), \
+             patch.object(handler, "_send_error", new=AsyncMock()) as se, \
+             patch.object(handler, "_handle_message", new=AsyncMock()) as hm, \
+             patch.object(handler, "_handle_chunk_upload", new=AsyncMock()) as hc:
+            await handler.handle_connection(FrameSocket(), "/")
+            hm.assert_awaited_once()
+            assert hm.await_args.args[2] == {"type": "ping", "data": {}}
+            hc.assert_awaited_once()
+            assert bytes(hc.await_args.args[2]["chunk_bytes"]) == b"RAW"
+            assert not err_types(se)
@@ -9,7 +9,7 @@
 5. session TTL sweep + 硬数量上限
 6. 提交后错误不删最终文件(错误分级)
 
-mock task_manager / save_uploaded_file / db_manager 隔离。
+mock task_manager / move_uploaded_file / db_manager 隔离。
 """
 import hashlib
 import time
@@ -67,8 +67,8 @@ class TestQueueFullMapping:
         fake_task = TranscriptionTask(task_id=task_id, file_name="a.wav", file_path="",
                                       file_size=10, file_hash="h", engine="qwen3")
         with patch("src.core.task_manager.task_manager") as tm, \
-             patch("src.utils.file_utils.save_uploaded_file",
-                   new=AsyncMock(return_value=("/tmp/final_a.wav", None))), \
+             patch("src.utils.file_utils.move_uploaded_file",
+                   new=AsyncMock(return_value="/tmp/final_a.wav")), \
              patch.object(handler, "_send_message", new=AsyncMock()) as sm, \
              patch.object(handler, "_send_error", new=AsyncMock()) as se:
             tm.create_task = AsyncMock(return_value=fake_task)
@@ -89,8 +89,8 @@ class TestQueueFullMapping:
         fake_task = TranscriptionTask(task_id=task_id, file_name="a.wav", file_path="",
                                       file_size=10, file_hash="h", engine="qwen3")
         with patch("src.core.task_manager.task_manager") as tm, \
-             patch("src.utils.file_utils.save_uploaded_file",
-                   new=AsyncMock(return_value=("/tmp/final_a.wav", None))), \
+             patch("src.utils.file_utils.move_uploaded_file",
+                   new=AsyncMock(return_value="/tmp/final_a.wav")), \
              patch.object(handler, "_send_message", new=AsyncMock()), \
              patch.object(handler, "_send_error", new=AsyncMock()):
             tm.create_task = AsyncMock(return_value=fake_task)
@@ -109,8 +109,8 @@ class TestRealErrorCleansUp:
         fake_task = TranscriptionTask(task_id=task_id, file_name="a.wav", file_path="",
                                       file_size=10, file_hash="h", engine="qwen3")
         with patch("src.core.task_manager.task_manager") as tm, \
-             patch("src.utils.file_utils.save_uploaded_file",
-                   new=AsyncMock(return_value=("/tmp/final_a.wav", None))), \
+             patch("src.utils.file_utils.move_uploaded_file",
+                   new=AsyncMock(return_value="/tmp/final_a.wav")), \
              patch.object(handler, "_send_message", new=AsyncMock()), \
              patch.object(handler, "_send_error", new=AsyncMock()):
             tm.create_task = AsyncMock(return_value=fake_task)
@@ -190,3 +190,62 @@ class TestSessionSweep:
         }
         handler._sweep_upload_sessions()
         assert "fresh" in handler.upload_sessions
+
+
+class TestFinalizeMovesTempFile:
+    @pytest.mark.asyncio
+    async def test_temp_file_moved_into_upload_dir(self, handler, fake_ws, tmp_path, monkeypatch):
+        """finalize 直接 rename 临时文件到上传目录（按 hash 命名），不再读入后重写"""
+        from src.core.config import config
+        from src.models.schemas import TranscriptionTask
+        upload_dir = tmp_path / "uploads"
+        monkeypatch.setattr(config.server, "upload_dir", str(upload_dir))
+        task_id, temp = setup_session(handler, tmp_path)
+        file_hash = handler.upload_sessions[task_id]["file_hash"]
+        fake_task = TranscriptionTask(task_id=task_id, file_name="a.wav", file_path="",
+                                      file_size=10, file_hash="h", engine="qwen3")
+        with patch("src.core.task_manager.task_manager") as tm, \
+             patch.object(handler, "_send_message", new=AsyncMock()), \
+             patch.object(handler, "_send_error", new=AsyncMock()):
+            tm.create_task = AsyncMock(return_value=fake_task)
+            tm.submit_task = AsyncMock(return_value=None)
+            await handler._finalize_chunked_upload(fake_ws, task_id)
+
+            final_path = upload_dir / f"{file_hash}.wav"
+            tm.submit_task.assert_awaited_once_with(task_id, str(final_path))
+            assert final_path.read_bytes() == b"hello-world-audio"
+            assert not temp.exists()
+
+    @pytest.mark.asyncio
+    async def test_queue_full_retry_reuses_moved_file(self, handler, fake_ws, tmp_path, monkeypatch):
+        """queue_full 后重试 finalize：临时文件已被 rename，重试直接复用已落地文件，不重新校验也不删文件"""
+        from src.core.config import config
+        from src.models.schemas import TranscriptionTask
+        upload_dir = tmp_path / "uploads"
+        monkeypatch.setattr(config.server, "upload_dir", str(upload_dir))
+        task_id, temp = setup_session(handler, tmp_path)
+        file_hash = handler.upload_sessions[task_id]["file_hash"]
+        fake_task = TranscriptionTask(task_id=task_id, file_name="a.wav", file_path="",
+                                      file_size=10, file_hash="h", engine="qwen3")
+        with patch("src.core.task_manager.task_manager") as tm, \
+             patch.object(handler, "_send_message", new=AsyncMock()) as sm, \
+             patch.object(handler, "_send_error", new=AsyncMock()) as se:
+            tm.create_task = AsyncMock(return_value=fake_task)
+            tm.submit_task = AsyncMock(side_effect=[
+                QueueFullError(retry_after=30, queue_size=20, max_queue_size=20),
+                None,
+            ])
+            await handler._finalize_chunked_upload(fake_ws, task_id)
+            assert not temp.exists()
+            assert task_id in handler.upload_sessions
+
+            await handler._handle_finalize_upload(fake_ws, task_id)
+
+            final_path = upload_dir / f"{file_hash}.wav"
+            assert tm.submit_task.await_count == 2
+            assert tm.submit_task.await_args.args == (task_id, str(final_path))
+            assert final_path.read_bytes() == b"hello-world-audio"
+            types, errs = sent_types(sm, se)
+            assert "queue_full" in types
+            assert errs == []
+            assert task_id not in handler.upload_sessions